@@ -1,66 +1,100 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func # For random in get_random_ayah_from_verse_table
+from sqlalchemy import func # func for random in get_random_ayah_from_verse_table
+from sqlalchemy.dialects.postgresql import insert as pg_insert # For UPSERTs
+from collections import Counter
 import re # For normalization
+import random # For get_random_ayah_from_verse_table
 from models import * # Ensure all your models are imported
 from schemas import * # Ensure all your schemas are imported
 from typing import List, Optional, Union, Any
 from uuid import UUID
 
 # +++ ARABIC TEXT NORMALIZATION FOR QURANIC SCRIPT COMPARISON +++
+# One translation table built at import covers every per-character step
+# (diacritic removal, dagger-alif/alif-wasla folding, tatweel removal), so the
+# whole normalization is a single C-level str.translate pass plus the space
+# collapse. Mirrors quran.normalize_ar() in Postgres (migration 010) — the two
+# must stay in sync so index-build-time and query-time preprocessing agree.
+_AR_TRANSLATE = {cp: None for r in (
+    range(0x064B, 0x0660), range(0x06D6, 0x06DD),
+    range(0x06DF, 0x06E9), range(0x06EA, 0x06EE),
+) for cp in r}
+_AR_TRANSLATE[0x0670] = '\u0627'  # Dagger Alif -> standard Alif
+_AR_TRANSLATE[0x0671] = '\u0627'  # Alif Wasla -> standard Alif
+_AR_TRANSLATE[0x0640] = None      # Tatweel removed
+
 def normalize_arabic_quranic_text_for_comparison(text: str) -> str:
     if not text:
         return ""
-    
-    # --- For Debugging Normalization ---
-    # print(f"Original DB Text Slice: '{text[:50]}'")
-
-    # Step 1: Remove common diacritics.
-    diacritics_pattern = r'[\u064B-\u065F\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED]' 
-    text_no_diacritics = re.sub(diacritics_pattern, '', text)
-    # print(f"After Diacritic Removal: '{text_no_diacritics[:50]}'")
-    
-    # Step 2: Specifically replace Dagger Alif (U+0670) with standard Alif (U+0627)
-    text_processed_dagger_alif = text_no_diacritics.replace('\u0670', '\u0627') 
-    # print(f"After Dagger Alif Norm: '{text_processed_dagger_alif[:50]}'")
-    
-    # Step 3: Normalize Alif Wasla (ٱ - U+0671) to standard Alif (ا - U+0627)
-    text_processed_alefs = text_processed_dagger_alif.replace('\u0671', '\u0627')
-    # print(f"After Alif Wasla Norm: '{text_processed_alefs[:50]}'")
-    
-    # Step 4: Remove Tatweel (ـ - U+0640)
-    final_text_no_tatweel = text_processed_alefs.replace('\u0640', '')
-    # print(f"After Tatweel Removal: '{final_text_no_tatweel[:50]}'")
-    
-    # Step 5: Normalize spaces - crucial for consistent word splitting
-    # This replaces multiple whitespace characters (including non-breaking spaces if any) with a single space.
-    normalized_spaces_text = ' '.join(final_text_no_tatweel.split())
-    stripped_text = normalized_spaces_text.strip()
-    # print(f"After Space Normalization & Strip: '{stripped_text[:50]}'")
-    
-    return stripped_text
+    translated = text.translate(_AR_TRANSLATE)
+    # Normalize spaces - crucial for consistent word splitting. Collapses any
+    # whitespace run (including non-breaking spaces) to a single space.
+    return ' '.join(translated.split())
 # +++ END OF NORMALIZATION FUNCTION +++
 
-# Helper function for word sequence matching
-def _is_word_subsequence(query_words: List[str], text_words: List[str]) -> bool:
-    n = len(query_words)
-    m = len(text_words)
-    
-    # print(f"Comparing query_words: {query_words} (len {n}) with text_words: {text_words} (len {m})")
-
-    if n == 0: return False 
-    if n > m: return False
-
-    for i in range(m - n + 1):
-        match = True
-        for j in range(n):
-            if text_words[i+j] != query_words[j]:
-                match = False
-                break
-        if match:
-            # print(f"Subsequence found at index {i}")
-            return True
-    # print("Subsequence not found")
-    return False
+# Word sequence matching is a plain substring test: both sides carry sentinel
+# spaces at the ends, so ' q1 q2 ' appearing in ' w1 w2 w3 ' is exactly the
+# consecutive-words check. Since migration 010 the normalized text lives in a
+# generated text_norm column and the test runs in Postgres (a trigram-index
+# prunable LIKE plus the padded boundary check) rather than per row in Python.
+
+# === IN-MEMORY CACHES FOR IMMUTABLE REFERENCE DATA ===
+# The Chapters/Juzs/Hizbs tables are tiny (114/30/60 rows) and never change,
+# yet they were queried from Postgres on every request. They are preloaded
+# once at app startup (see main.py); the getters below fall back to the DB
+# if the caches have not been populated (e.g. in scripts).
+_CHAPTERS_SORTED: List["Chapters"] = []
+_CHAPTERS_BY_ID: dict = {}
+_CHAPTERS_BY_NUMBER: dict = {}
+# ayah_index -> surah_id for Hafs, Warsh.id -> (sura_name_ar, sura_name_en):
+# both immutable mappings (~6.2k small rows each), so get_surah_name_by_ayah_id
+# becomes a dict lookup instead of two chained queries per call.
+_AYAH_SURAH_ID: dict = {}
+_WARSH_SURAH_NAMES: dict = {}
+_JUZS_SORTED: List["Juzs"] = []
+_HIZBS_SORTED: List["Hizbs"] = []
+# (id, text) rows for the random-ayah endpoint: random.choice on a warm
+# tuple instead of a DB probe per call.
+_RANDOM_AYAH_POOL: tuple = ()
+
+
+def preload_reference_data(db: Session):
+    """Populates the module-level reference caches. Called once at startup."""
+    global _CHAPTERS_SORTED, _CHAPTERS_BY_ID, _CHAPTERS_BY_NUMBER
+    global _AYAH_SURAH_ID, _WARSH_SURAH_NAMES, _JUZS_SORTED, _HIZBS_SORTED
+    _CHAPTERS_SORTED = db.query(Chapters).order_by(Chapters.chapter_number).all()
+    _CHAPTERS_BY_ID = {chapter.id: chapter for chapter in _CHAPTERS_SORTED}
+    _CHAPTERS_BY_NUMBER = {chapter.chapter_number: chapter for chapter in _CHAPTERS_SORTED}
+    _AYAH_SURAH_ID = dict(db.query(Ayah.ayah_index, Ayah.surah_id).all())
+    _WARSH_SURAH_NAMES = {
+        row.id: (row.sura_name_ar, row.sura_name_en)
+        for row in db.query(Warsh.id, Warsh.sura_name_ar, Warsh.sura_name_en).all()
+    }
+    _JUZS_SORTED = db.query(Juzs).order_by(Juzs.juz_number).all()
+    _HIZBS_SORTED = db.query(Hizbs).order_by(Hizbs.hizb_number).all()
+    # Fully warm the page-lookup caches too (instead of lazily, key by key),
+    # so the surah-alone / page-alone search paths and the verse->page
+    # endpoint never touch Postgres after startup.
+    for surah_no, page_num in db.query(Verse.surah, Ayah.page_num).join(
+            Ayah, Ayah.ayah_index == Verse.id).filter(Verse.ayah_number == 1).all():
+        _PAGE_FOR_SURAH_CACHE[(1, surah_no)] = page_num
+    # Ordered by id so the first row per surah wins, matching the lookup.
+    for sura_no, page_num in db.query(Warsh.sura_no, Warsh.page).filter(
+            Warsh.aya_no == 1).order_by(Warsh.id).all():
+        _PAGE_FOR_SURAH_CACHE.setdefault((2, sura_no), page_num)
+    for (page_num,) in db.query(Ayah.page_num).distinct():
+        _PAGE_EXISTS_CACHE[(1, page_num)] = True
+    for (page_num,) in db.query(Warsh.page).distinct():
+        _PAGE_EXISTS_CACHE[(2, page_num)] = True
+    for ayah_index, page_num in db.query(Ayah.ayah_index, Ayah.page_num).all():
+        _VERSE_PAGE_CACHE[(1, ayah_index)] = page_num
+    for warsh_id, page_num in db.query(Warsh.id, Warsh.page).all():
+        _VERSE_PAGE_CACHE[(2, warsh_id)] = page_num
+    # Random-ayah pool: ~6236 (id, text) rows, about 1 MB. The table is
+    # immutable, so picking in Python replaces a DB round trip per call.
+    global _RANDOM_AYAH_POOL
+    _RANDOM_AYAH_POOL = tuple(db.query(Verse.id, Verse.text).all())
+
 
 # --- Authentication (Assumed to be as per your latest version) ---
 def get_user_by_username(db: Session, username: str):
@@ -74,7 +108,7 @@ def create_app_user(db: Session, user_id: UUID, username: str, email: str, phone
     return user
 
 def update_user_info(db: Session, user_id: UUID, new_data: dict):
-    user = db.query(AppUser).filter(AppUser.id == user_id).first()
+    user = db.get(AppUser, user_id) # PK fetch hits the identity map first
     if not user:
         return None
     for key, value in new_data.items():
@@ -86,150 +120,198 @@ def update_user_info(db: Session, user_id: UUID, new_data: dict):
 
 # === CHAPTERS ===
 def get_all_chapters(db: Session):
+    if _CHAPTERS_SORTED:
+        return _CHAPTERS_SORTED
     return db.query(Chapters).order_by(Chapters.chapter_number).all()
 
 
 def get_chapter_by_id(db: Session, chapter_id: int):
-    return db.query(Chapters).filter(Chapters.id == chapter_id).first()
+    if _CHAPTERS_BY_ID:
+        return _CHAPTERS_BY_ID.get(chapter_id)
+    return db.get(Chapters, chapter_id) # PK fetch hits the identity map first
 
 
 # === JUZS ===
 def get_all_juzs(db: Session):
+    if _JUZS_SORTED:
+        return _JUZS_SORTED
     return db.query(Juzs).order_by(Juzs.juz_number).all()
 
 
 def get_juz_start_page(db: Session, juz_id: int):
-    juz = db.query(Juzs).filter(Juzs.id == juz_id).first()
-    if juz is None or juz.first_verse_id is None:
-        return None
-    # This was returning VersePages, but likely you need the page number.
-    # Assuming Hafs context for VersePages. This needs to be mushaf-aware if used generally.
-    # For now, let's assume it's for Hafs and we need Ayah table.
-    verse_page_info = db.query(Ayah).filter(Ayah.ayah_index == juz.first_verse_id).first()
-    return verse_page_info.page_num if verse_page_info else None
+    # Single JOIN instead of Juzs lookup followed by an Ayah lookup.
+    # Assuming Hafs context, so the page comes from the Ayah table.
+    return db.query(Ayah.page_num).join(
+        Juzs, Juzs.first_verse_id == Ayah.ayah_index
+    ).filter(Juzs.id == juz_id).scalar()
 
 
 # === HIZBS ===
 def get_all_hizbs(db: Session):
+    if _HIZBS_SORTED:
+        return _HIZBS_SORTED
     return db.query(Hizbs).order_by(Hizbs.hizb_number).all()
 
 
-def get_hizb_start_page(db: Session, first_verse_id: int):
-    # Similar to get_juz_start_page, this needs context or refinement.
-    verse_page_info = db.query(Ayah).filter(Ayah.ayah_index == first_verse_id).first()
-    return verse_page_info.page_num if verse_page_info else None
+def get_hizb_start_page(db: Session, hizb_id: int):
+    # Same JOIN collapse as get_juz_start_page: one query from hizb id to page.
+    return db.query(Ayah.page_num).join(
+        Hizbs, Hizbs.first_verse_id == Ayah.ayah_index
+    ).filter(Hizbs.id == hizb_id).scalar()
 
 
 # === MUSHAF PAGES ===
+# Page layout rows never change, so cache them like the other reference data.
+_MUSHAF_PAGE_CACHE: dict = {}
+
 def get_mushaf_page(db: Session, page_number: int, mushaf_id_filter: Optional[int] = 20):
     """
     Gets page details from quran.mushaf_pages.
     Note: The original MushafPages table has a mushaf_id column.
     We should filter by it if applicable. Defaulting to 1 (Hafs) for now.
     """
-    return db.query(MushafPages).filter(
+    cache_key = (page_number, mushaf_id_filter)
+    if cache_key in _MUSHAF_PAGE_CACHE:
+        return _MUSHAF_PAGE_CACHE[cache_key]
+    page = db.query(MushafPages).filter(
         MushafPages.page_number == page_number,
         MushafPages.mushaf_id == mushaf_id_filter # Adjust if your table structure differs
     ).first()
+    if page is not None:
+        _MUSHAF_PAGE_CACHE[cache_key] = page
+    return page
 
 
 # === VERSES ===
 def get_verses_in_page(db: Session, first_verse_id: int, last_verse_id: int):
     """ Original function for Hafs, fetches verses for a given range of verse IDs """
+    # Chapters data (name/bismillah) comes from the startup caches, so this is
+    # a single Verse range query with no join at all.
     verses = db.query(Verse).filter(
         Verse.id >= first_verse_id,
         Verse.id <= last_verse_id
-    ).order_by(Verse.id).all() # Added order_by for consistency
+    ).order_by(Verse.id).all()
 
     results = []
     for verse in verses:
-        if verse.verse_key and ":" in verse.verse_key:
-            try:
-                surah_id, verse_number = map(int, verse.verse_key.split(":"))
-                if verse_number == 1: # Add Bismillah and Surah name for first verse of Surah
-                    surah_info = db.query(Chapters).filter(Chapters.id == surah_id).first() # Use Chapters.id
-                    if surah_info and surah_info.name_arabic:
-                        # Ensure text is not None before prepending
-                        current_text = verse.text if verse.text else ""
-                        # For Surah At-Tawbah (ID 9), Bismillah is not recited.
-                        bismillah_text = "بسم الله الرحمن الرحيم\n" if surah_id != 9 and surah_info.bismillah_pre else ""
-                        verse.text = f"سورة {surah_info.name_arabic.strip()}\n{bismillah_text}{current_text}"
-            except ValueError:
-                # Skip malformed keys or log an error
-                pass
+        # ayah_number is the materialized verse number (migration 004), so no
+        # more verse_key split + int() per verse.
+        if verse.ayah_number == 1: # Add Bismillah and Surah name for first verse of Surah
+            chapter = get_chapter_by_id(db, verse.surah)
+            if chapter is not None and chapter.name_arabic:
+                # Ensure text is not None before prepending
+                current_text = verse.text if verse.text else ""
+                # For Surah At-Tawbah (ID 9), Bismillah is not recited.
+                bismillah_text = "بسم الله الرحمن الرحيم\n" if verse.surah != 9 and chapter.bismillah_pre else ""
+                verse.text = f"سورة {chapter.name_arabic.strip()}\n{bismillah_text}{current_text}"
         results.append(verse)
     return results
 
 
-def get_warsh_verses_in_page(db: Session, page: str):
-    """ Original function for Warsh, fetches verses for a given page string """
-    # Ensure page is treated as a string for Warsh
-    verses = db.query(Warsh).filter(Warsh.page == str(page)).order_by(Warsh.id).all() # Added order_by
+def get_chapter_by_number(db: Session, chapter_number: int):
+    if _CHAPTERS_BY_NUMBER:
+        return _CHAPTERS_BY_NUMBER.get(chapter_number)
+    return db.query(Chapters).filter(Chapters.chapter_number == chapter_number).first()
+
 
+def get_warsh_verses_in_page(db: Session, page: int):
+    """ Original function for Warsh, fetches verses for a given page number """
+    # Same cache usage as the Hafs version: the Chapters info for surah starts
+    # comes from the startup caches instead of a per-request join.
+    verses = db.query(Warsh).filter(Warsh.page == page).order_by(Warsh.id).all()
+
+    results = []
     for verse in verses:
         if verse.aya_no == 1 and verse.sura_no is not None: # Add Bismillah and Surah name
+            chapter = get_chapter_by_number(db, verse.sura_no)
+            chapter_id = chapter.id if chapter else None
             # Surah At-Tawbah (ID 9) does not have Bismillah
-            # Warsh table has sura_name_ar, check if Chapters.bismillah_pre applies or if sura_no 9 is universal
-            chapter_info = db.query(Chapters).filter(Chapters.chapter_number == verse.sura_no).first()
             bismillah_text = "بسم الله الرحمن الرحيم\n"
-            if chapter_info and chapter_info.id == 9: # Assuming chapter_info.id is the surah number for comparison
+            if chapter_id == 9: # Assuming chapter id is the surah number for comparison
                  bismillah_text = ""
-            elif chapter_info and not chapter_info.bismillah_pre: # If bismillah_pre is explicitly false
+            elif chapter_id is not None and not chapter.bismillah_pre: # If bismillah_pre is explicitly false
                  bismillah_text = ""
 
-
             current_text = verse.aya_text if verse.aya_text else ""
             # Use sura_name_ar from Warsh table itself if available and preferred
-            surah_title = f"سورة {verse.sura_name_ar.strip()}" if verse.sura_name_ar else f"سورة {chapter_info.name_arabic.strip() if chapter_info else ''}"
+            chapter_name_arabic = chapter.name_arabic if chapter else None
+            surah_title = f"سورة {verse.sura_name_ar.strip()}" if verse.sura_name_ar else f"سورة {chapter_name_arabic.strip() if chapter_name_arabic else ''}"
             verse.aya_text = f"{surah_title}\n{bismillah_text}{current_text}"
-    return verses
+        results.append(verse)
+    return results
 
 
 # === UPDATED SEARCH LOGIC ===
 
+# Static Quran metadata, so these per-argument caches never need invalidation.
+# Key spaces are tiny (<= 114 surahs / ~604 pages x 2 mushafs).
+_PAGE_FOR_SURAH_CACHE: dict = {}
+_PAGE_EXISTS_CACHE: dict = {}
+_WARSH_VERSE_COUNT_CACHE: dict = {}
+_VERSE_PAGE_CACHE: dict = {}
+
 def get_page_for_surah(db: Session, mushaf_id: int, surah_number: int) -> Optional[int]:
     """
     Gets the page number where a given Surah starts.
+    Results are cached in-process: the mapping is static Quran metadata.
     """
+    cache_key = (mushaf_id, surah_number)
+    if cache_key in _PAGE_FOR_SURAH_CACHE:
+        return _PAGE_FOR_SURAH_CACHE[cache_key]
+    page = _query_page_for_surah(db, mushaf_id, surah_number)
+    if page is not None:
+        _PAGE_FOR_SURAH_CACHE[cache_key] = page
+    return page
+
+def _query_page_for_surah(db: Session, mushaf_id: int, surah_number: int) -> Optional[int]:
     if mushaf_id == 1:  # Hafs
-        # Find the first verse of the surah (e.g., verse_key = "surah_number:1")
-        first_verse_in_surah = db.query(Verse).filter(Verse.verse_key == f"{surah_number}:1").first()
-        if not first_verse_in_surah:
-            return None
-        # Get its page_num from Ayah table using Verse.id as Ayah.ayah_index
-        ayah_entry = db.query(Ayah).filter(Ayah.ayah_index == first_verse_in_surah.id).first()
-        return ayah_entry.page_num if ayah_entry else None
+        # Single JOIN: first verse of the surah ("surah_number:1") straight to
+        # its page_num in the Ayah table, instead of two sequential queries.
+        return db.query(Ayah.page_num).join(
+            Verse, Verse.id == Ayah.ayah_index
+        ).filter(Verse.surah == surah_number, Verse.ayah_number == 1).scalar()
     elif mushaf_id == 2:  # Warsh
-        # Find the first verse (aya_no = 1) of the surah (sura_no)
-        first_verse_in_surah = db.query(Warsh).filter(
+        # Select only the page column rather than hydrating the whole row.
+        return db.query(Warsh.page).filter(
             Warsh.sura_no == surah_number,
             Warsh.aya_no == 1
-        ).order_by(Warsh.id).first() # Ensure we get the very first one if multiple due to data issues
-        if not first_verse_in_surah or first_verse_in_surah.page is None:
-            return None
-        try:
-            return int(first_verse_in_surah.page)
-        except ValueError:
-            # Handle cases where Warsh.page might not be a simple integer string
-            # This might indicate a data issue or a different page numbering scheme
-            return None # Or log an error
+        ).order_by(Warsh.id).limit(1).scalar() # First one in case of data issues
     return None
 
 def check_page_exists(db: Session, mushaf_id: int, page_number: int) -> bool:
+    cache_key = (mushaf_id, page_number)
+    cached = _PAGE_EXISTS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    # query(...).exists() compiles to SELECT EXISTS(...): no row hydration,
+    # Postgres stops at the first matching row.
     if mushaf_id == 1: 
-        return db.query(Ayah).filter(Ayah.page_num == page_number).first() is not None
+        exists = db.query(db.query(Ayah).filter(Ayah.page_num == page_number).exists()).scalar()
     elif mushaf_id == 2: 
-        return db.query(Warsh).filter(Warsh.page == str(page_number)).first() is not None
-    return False
+        exists = db.query(db.query(Warsh).filter(Warsh.page == page_number).exists()).scalar()
+    else:
+        return False
+    _PAGE_EXISTS_CACHE[cache_key] = exists
+    return exists
 
 # //////////////CHANGE MARIA (crud.py - Search logic refinement for single words like "في")
+# (mushaf_id, padded query, surah_id, page_number, verse_num) -> tuple of ids.
+# Safe to keep for the process lifetime: the Quran text never changes.
+_SEARCH_RESULT_CACHE: dict = {}
+_SEARCH_CACHE_MAX = 4096
+
 def search_verses_complex(db: Session, mushaf_id: int, user_query_text: Optional[str] = None,
                           surah_id: Optional[int] = None, page_number: Optional[int] = None,
-                          verse_num: Optional[int] = None) -> List[Any]:
+                          verse_num: Optional[int] = None, limit: Optional[int] = None,
+                          after_verse_id: Optional[int] = None) -> List[Any]:
     
     candidate_verses_query = None
-    if mushaf_id == 1: 
-        candidate_verses_query = db.query(Verse)
+    # Column tuples, not ORM entities: the route only reads id/text, so there
+    # is no reason to pay per-row hydration, identity-map bookkeeping and
+    # change tracking for read-only search hits. Attribute access on the
+    # returned Rows (v.id, v.text / v.aya_text) stays the same for callers.
+    if mushaf_id == 1:
+        candidate_verses_query = db.query(Verse.id, Verse.text, Verse.verse_key, Verse.surah)
         if verse_num is not None and surah_id is not None:
             verse_key_to_find = f"{surah_id}:{verse_num}"
             candidate_verses_query = candidate_verses_query.filter(Verse.verse_key == verse_key_to_find)
@@ -241,93 +323,135 @@ def search_verses_complex(db: Session, mushaf_id: int, user_query_text: Optional
         elif surah_id is not None: 
              candidate_verses_query = candidate_verses_query.filter(Verse.surah == surah_id)
     elif mushaf_id == 2: 
-        candidate_verses_query = db.query(Warsh)
+        candidate_verses_query = db.query(Warsh.id, Warsh.aya_text, Warsh.sura_no, Warsh.aya_no, Warsh.page)
         if verse_num is not None and surah_id is not None:
             candidate_verses_query = candidate_verses_query.filter(Warsh.sura_no == surah_id, Warsh.aya_no == verse_num)
         elif page_number is not None:
-            candidate_verses_query = candidate_verses_query.filter(Warsh.page == str(page_number))
+            candidate_verses_query = candidate_verses_query.filter(Warsh.page == page_number)
         elif surah_id is not None: 
             candidate_verses_query = candidate_verses_query.filter(Warsh.sura_no == surah_id)
     else:
         return [] 
 
-    if candidate_verses_query is None: return [] 
-    
-    all_candidate_verses = candidate_verses_query.order_by(Verse.id if mushaf_id == 1 else Warsh.id).all()
-    
+    if candidate_verses_query is None: return []
+
+    id_col = Verse.id if mushaf_id == 1 else Warsh.id
+    # Keyset pagination: ids are the sort key, so "everything after the last
+    # id the client saw" is one indexed range condition — no OFFSET row skip.
+    if after_verse_id is not None:
+        candidate_verses_query = candidate_verses_query.filter(id_col > after_verse_id)
+    candidate_verses_query = candidate_verses_query.order_by(id_col)
+
+    # No query text: decide before touching the DB, so the branches that
+    # return [] never materialize the candidate rows at all.
     if not user_query_text:
         if (verse_num is not None and surah_id is not None) or \
            (page_number is not None) or \
-           (surah_id is not None and not page_number and not verse_num): 
-            return all_candidate_verses 
-        else: 
+           (surah_id is not None and not page_number and not verse_num):
+            if limit is not None:
+                candidate_verses_query = candidate_verses_query.limit(limit)
+            return candidate_verses_query.all()
+        else:
             return []
 
     stripped_user_query = user_query_text.strip()
-    if not stripped_user_query: return [] 
-    
+    if not stripped_user_query: return []
+
     user_query_words = stripped_user_query.split()
-    if not user_query_words: return [] 
+    if not user_query_words: return []
+
+    # Built once per search: sentinel spaces keep word boundaries explicit so a
+    # substring hit is exactly a consecutive-words match.
+    query_str = ' ' + ' '.join(user_query_words) + ' '
+
+    # Result cache: the corpus is immutable, so a repeated (mushaf, query,
+    # filters) combination always yields the same verse ids. On a hit, one
+    # IN query re-fetches the rows and the LIKE scan is skipped.
+    cache_key = (mushaf_id, query_str, surah_id, page_number, verse_num, limit, after_verse_id)
+    cached_ids = _SEARCH_RESULT_CACHE.get(cache_key)
+    if cached_ids is not None:
+        if not cached_ids:
+            return []
+        if mushaf_id == 1:
+            return db.query(Verse.id, Verse.text, Verse.verse_key, Verse.surah)\
+                .filter(Verse.id.in_(cached_ids)).order_by(Verse.id).all()
+        return db.query(Warsh.id, Warsh.aya_text, Warsh.sura_no, Warsh.aya_no, Warsh.page)\
+            .filter(Warsh.id.in_(cached_ids)).order_by(Warsh.id).all()
+
+    # The whole match runs in SQL against the generated text_norm column.
+    # Two LIKEs: the plain one on text_norm is what the trigram GIN index
+    # (migration 010) can prune with — the planner cannot match the index to
+    # the concat() expression — and the padded one keeps the exact
+    # consecutive-words semantics via sentinel spaces. The padded match
+    # implies the plain one, so adding the prefilter never drops a hit.
+    # LIKE wildcards in user input are escaped so they match literally.
+    escaped_words = ' '.join(user_query_words).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    escaped_query = ' ' + escaped_words + ' '
+    norm_col = Verse.text_norm if mushaf_id == 1 else Warsh.text_norm
+    matched_query = candidate_verses_query.filter(
+        norm_col.like('%' + escaped_words + '%', escape='\\'),
+        func.concat(' ', norm_col, ' ').like('%' + escaped_query + '%', escape='\\')
+    )
+    if limit is not None:
+        matched_query = matched_query.limit(limit)
+    matched_ayat = matched_query.all()
 
-    # print(f"User query words: {user_query_words}") # For debugging user input
+    # Crude size cap: wipe and start over rather than tracking LRU order.
+    if len(_SEARCH_RESULT_CACHE) >= _SEARCH_CACHE_MAX:
+        _SEARCH_RESULT_CACHE.clear()
+    _SEARCH_RESULT_CACHE[cache_key] = tuple(a.id for a in matched_ayat)
 
-    matched_ayat = []
-    for ayah_obj in all_candidate_verses: 
-        db_text_raw = ""
-        if mushaf_id == 1: 
-            db_text_raw = ayah_obj.text if ayah_obj.text else ""
-        elif mushaf_id == 2: 
-            db_text_raw = ayah_obj.aya_text if ayah_obj.aya_text else ""
-        
-        if not db_text_raw:
-            continue
-
-        db_text_for_comparison = normalize_arabic_quranic_text_for_comparison(db_text_raw)
-        db_text_words = db_text_for_comparison.split()
-
-        # ---- Debugging prints for matching logic ----
-        # if "في" in user_query_words: # Or any specific word you are testing
-        #     print(f"--- Ayah ID {ayah_obj.id} (Mushaf {mushaf_id}) ---")
-        #     print(f"Raw DB text: '{db_text_raw[:100]}...'")
-        #     print(f"Normalized DB text for comparison: '{db_text_for_comparison[:100]}...'")
-        #     print(f"DB text words: {db_text_words[:15]}...") # Print first few words
-        #     print(f"User query words: {user_query_words}")
-        # ---- End Debugging ----
-            
-        if not db_text_words: 
-            continue
-            
-        if _is_word_subsequence(user_query_words, db_text_words):
-            # print(f"MATCH FOUND for Ayah ID {ayah_obj.id}")
-            matched_ayat.append(ayah_obj) 
-        # else:
-            # if "في" in user_query_words:
-                # print(f"NO MATCH for Ayah ID {ayah_obj.id}")
-            
     return matched_ayat
 # //////////////CHANGE MARIA
 
 
+def get_pages_for_verse_ids(db: Session, mushaf_id: int, verse_ids: List[int]) -> dict:
+    """ Batch variant of get_page_from_verse_id: one IN query for whatever
+    the warmed cache does not already hold, never one query per verse. """
+    pages = {}
+    missing = []
+    for verse_id in verse_ids:
+        cached = _VERSE_PAGE_CACHE.get((mushaf_id, verse_id))
+        if cached is not None:
+            pages[verse_id] = cached
+        else:
+            missing.append(verse_id)
+    if missing:
+        if mushaf_id == 1:
+            fetched = db.query(Ayah.ayah_index, Ayah.page_num).filter(Ayah.ayah_index.in_(missing)).all()
+        elif mushaf_id == 2:
+            fetched = db.query(Warsh.id, Warsh.page).filter(Warsh.id.in_(missing)).all()
+        else:
+            fetched = []
+        for verse_id, page_num in fetched:
+            pages[verse_id] = page_num
+            _VERSE_PAGE_CACHE[(mushaf_id, verse_id)] = page_num
+    return pages
+
+
 def get_page_from_verse_id(db: Session, mushaf_id: int, verse_id: int):
     """ Original function to get page from verse ID. """
+    cached = _VERSE_PAGE_CACHE.get((mushaf_id, verse_id))
+    if cached is not None:
+        return cached
+    # Only the page column is needed, so skip hydrating full rows.
     if mushaf_id == 1: # Hafs
         # verse_id is Ayah.ayah_index
-        ayah_entry = db.query(Ayah).filter(Ayah.ayah_index == verse_id).first()
-        if ayah_entry:
-            return ayah_entry.page_num
+        return db.query(Ayah.page_num).filter(Ayah.ayah_index == verse_id).scalar()
     elif mushaf_id == 2: # Warsh
         # verse_id is Warsh.id
-        verse_entry = db.query(Warsh).filter(Warsh.id == verse_id).first()
-        if verse_entry and verse_entry.page is not None:
-            try:
-                return int(verse_entry.page)
-            except ValueError:
-                return None # Or handle non-integer page strings
+        return db.query(Warsh.page).filter(Warsh.id == verse_id).scalar() # Integer column since migration 001
     return None
 
 # --- Tafsir, Translation, Recitation, Mushaf Page Creation (Assumed to be as per your latest version) ---
 # //CHANGE TO THE OLD (If any of these were different in your first version and not search-related)
 # These functions seem standard and likely evolved with your app's features.
+# Tafsir and translation content is immutable reference data, so results are
+# memoized per (verse_id, language_id). ORM rows are safe to keep across
+# requests here: they are fully loaded and never mutated by the app.
+_TAFSIR_CACHE: dict = {}
+_TRANSLATION_CACHE: dict = {}
+
 def get_tafsir_logic(db: Session, verse_id: int, language_id: int, mushaf_id: int):
     if mushaf_id == 2: # Warsh
         # Tafsir for Warsh might need specific handling if Warsh verse IDs don't map to Tafsirs.verse_id
@@ -336,11 +460,16 @@ def get_tafsir_logic(db: Session, verse_id: int, language_id: int, mushaf_id: in
         # The prompt says "return 'warsh'", which implies it's a signal not a Tafsir object.
         return "warsh" # Placeholder, as Tafsir table seems Hafs-centric by verse_id
     
+    cache_key = (verse_id, language_id)
+    if cache_key in _TAFSIR_CACHE:
+        return _TAFSIR_CACHE[cache_key]
+
     tafsir = db.query(Tafsirs).filter(
         Tafsirs.verse_id == verse_id, # This verse_id needs to be the one used in Tafsirs table.
                                       # If Tafsirs table uses Hafs verse IDs, this needs adjustment for Warsh.
         Tafsirs.language_id == language_id
     ).first()
+    _TAFSIR_CACHE[cache_key] = tafsir # Misses are static too, so cache None as well
     return tafsir
 
 def get_translation_logic(db: Session, verse_id: int, language_id: int, mushaf_id: int):
@@ -353,14 +482,17 @@ def get_translation_logic(db: Session, verse_id: int, language_id: int, mushaf_i
     if language_id == 9: # Assuming 9 is Arabic, and no translation needed.
         return "no_arabic"
 
+    cache_key = (verse_id, language_id)
+    if cache_key in _TRANSLATION_CACHE:
+        return _TRANSLATION_CACHE[cache_key]
+
     # For Hafs: verse_id is Verse.id
-    verse_obj = db.query(Verse).filter(Verse.id == verse_id).first()
-    if not verse_obj or not verse_obj.verse_key or ":" not in verse_obj.verse_key:
+    verse_obj = db.get(Verse, verse_id) # PK fetch
+    if not verse_obj:
         return None
 
-    try:
-        sura, ayah = map(int, verse_obj.verse_key.split(":"))
-    except ValueError:
+    sura, ayah = verse_obj.surah, verse_obj.ayah_number # Numeric columns since migration 004
+    if sura is None or ayah is None:
         return None
 
     # Assuming Translation table uses sura and ayah numbers.
@@ -371,51 +503,44 @@ def get_translation_logic(db: Session, verse_id: int, language_id: int, mushaf_i
         # Example: Translation.language_id == language_id (if your Translation table has it)
     ).first() # This might need to be .all() if multiple translations for same ayah/lang
 
+    _TRANSLATION_CACHE[cache_key] = translation
     return translation
 
 # === RECITATION INTERVAL SUPPORT ===
 def get_verse_count_in_chapter(db: Session, chapter_id: int): # chapter_id is Chapters.id
-    chapter = db.query(Chapters).filter(Chapters.id == chapter_id).first()
+    chapter = get_chapter_by_id(db, chapter_id) # Served from the in-memory cache once preloaded
     return chapter.verses_count if chapter else None
 
 def get_warsh_verse_count(db: Session, surah_id: int): # surah_id is Warsh.sura_no
-    # This needs to get the max aya_no for that sura_no or use a dedicated count from Chapters/Warsh metadata
     # The Warsh table has `verse_count` per row, which seems to be total verses in that surah.
-    # Taking the first one should be fine if it's consistent.
+    # Taking the first one should be fine if it's consistent. Cached: static data.
+    if surah_id in _WARSH_VERSE_COUNT_CACHE:
+        return _WARSH_VERSE_COUNT_CACHE[surah_id]
     verse_info = db.query(Warsh.verse_count).filter(Warsh.sura_no == surah_id).first()
-    return verse_info[0] if verse_info else None
+    count = verse_info[0] if verse_info else None
+    if count is not None:
+        _WARSH_VERSE_COUNT_CACHE[surah_id] = count
+    return count
 
 def get_verses_by_interval(db: Session, chapter_id: int, start: int, end: int): # chapter_id is Chapters.id (surah number)
-    # Filters Hafs verses by surah number (from verse_key) and verse number (from verse_key)
-    
-    # This is inefficient as it queries all verses. Better to filter in DB if possible.
-    # However, verse_key is text. Splitting and casting in SQL is complex and DB-specific.
-    # For now, keeping Python filtering.
-    # A more performant way would be to construct verse_key strings if format is fixed.
-    # E.g. Verse.verse_key.between(f"{chapter_id}:{start}", f"{chapter_id}:{end}") might work if lexicographical.
-    # But numeric comparison is safer.
-    
-    # Alternative: Filter by Verse.surah == chapter_id first, then Python filter for verse number.
-    query = db.query(Verse).filter(Verse.surah == chapter_id)
-    
-    result = []
-    for verse in query.all(): # Iterate only over verses of the target surah
-        if verse.verse_key and ":" in verse.verse_key:
-            try:
-                # verse.surah should already match chapter_id
-                _, verse_num_str = verse.verse_key.split(":")
-                verse_num = int(verse_num_str)
-                if start <= verse_num <= end:
-                    result.append(verse)
-            except ValueError:
-                continue 
-    # Sort results by verse number (implicit if verse_key is like "S:V" and S is fixed)
-    # Or explicitly sort if needed: result.sort(key=lambda v: int(v.verse_key.split(':')[1]))
-    return result
+    # Filters Hafs verses by surah number and verse number, entirely in SQL.
+    # ayah_number is the materialized verse number (migration 004), backed by
+    # the (surah, ayah_number) index, so this is a plain range scan.
+    # Projects exactly the VerseOut fields: the rows only get serialized, so
+    # there is no reason to hydrate full ORM entities (and text_norm stays
+    # off the wire).
+    return db.query(Verse.id, Verse.verse_key, Verse.text, Verse.text_simple,
+                    Verse.surah).filter(
+        Verse.surah == chapter_id,
+        Verse.ayah_number.between(start, end)
+    ).order_by(Verse.ayah_number).all()
 
 
 def get_warsh_by_interval(db: Session, surah_no: int, start: int, end: int):
-    return db.query(Warsh).filter(
+    # Same column projection as the Hafs variant, matching WarshVerseOut.
+    return db.query(Warsh.id, Warsh.jozz, Warsh.page, Warsh.sura_no,
+                    Warsh.sura_name_ar, Warsh.aya_no, Warsh.aya_text,
+                    Warsh.text_simple, Warsh.verse_count).filter(
         Warsh.sura_no == surah_no,
         Warsh.aya_no >= start,
         Warsh.aya_no <= end
@@ -439,36 +564,52 @@ def create_mushaf_page(db: Session, page_number: int, first_verse_id: int, last_
 # === Frequent Errors Handling ===
 def update_frequent_errors(db: Session, user_id: UUID, mushaf_id: int, ayah_ids: List[int]):
     model = HafsError if mushaf_id == 1 else WarshError
-    for ayah_id in ayah_ids:
-        error = db.query(model).filter_by(user_id=user_id, ayah_id=ayah_id).first()
-        if error:
-            error.error_count += 1
-        else:
-            new_error = model(user_id=user_id, ayah_id=ayah_id, error_count=1) # type: ignore
-            db.add(new_error)
+    if not ayah_ids:
+        return
+    # Single UPSERT instead of one SELECT + INSERT/UPDATE pair per ayah.
+    # Duplicate ids in the input are aggregated first, both to keep the
+    # per-occurrence counting and because ON CONFLICT cannot touch the same
+    # row twice in one statement.
+    counts = Counter(ayah_ids)
+    stmt = pg_insert(model).values([
+        {"user_id": user_id, "ayah_id": ayah_id, "error_count": count}
+        for ayah_id, count in counts.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "ayah_id"],
+        set_={
+            "error_count": model.error_count + stmt.excluded.error_count,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
     db.commit()
 
 
 def get_user_frequent_errors(db: Session, user_id: UUID, mushaf_id: int) -> List[FrequentErrorOut]:
     model = HafsError if mushaf_id == 1 else WarshError
-    error_list = db.query(model).filter_by(user_id=user_id).order_by(model.updated_at.desc()).all() # type: ignore
+    # Single query: outer-join the text column directly onto the error rows.
+    # Outer join keeps errors whose ayah id has no text row (same behaviour as
+    # the old fallback string).
+    if mushaf_id == 1:
+        text_model, text_col = Verse, Verse.text
+    else: # mushaf_id == 2 (Warsh)
+        text_model, text_col = Warsh, Warsh.aya_text
+
+    rows = db.query(
+        model.ayah_id, model.error_count, model.created_at, model.updated_at, text_col
+    ).outerjoin(
+        text_model, text_model.id == model.ayah_id
+    ).filter(model.user_id == user_id).order_by(model.updated_at.desc()).all()
 
     results = []
-    for error in error_list:
-        text_val = ""
-        if mushaf_id == 1:
-            verse = db.query(Verse.text).filter_by(id=error.ayah_id).first() # Query only text
-            text_val = verse[0] if verse else "Ayah text not found"
-        else: # mushaf_id == 2 (Warsh)
-            verse = db.query(Warsh.aya_text).filter_by(id=error.ayah_id).first() # Query only aya_text
-            text_val = verse[0] if verse else "Ayah text not found"
-        
+    for ayah_id, error_count, created_at, updated_at, text_val in rows:
         results.append(FrequentErrorOut(
-            ayah_id=error.ayah_id,
-            text=text_val,
-            error_count=error.error_count,
-            created_at=error.created_at,
-            updated_at=error.updated_at,
+            ayah_id=ayah_id,
+            text=text_val or "Ayah text not found",
+            error_count=error_count,
+            created_at=created_at,
+            updated_at=updated_at,
         ))
     return results
 
@@ -483,30 +624,31 @@ def update_surah_progress(db: Session, user_id: UUID, mushaf_id: int, surah_id:
     print(f"LOG: Using ProgressModel: {ProgressModel.__name__}, ErrorModel: {ErrorModel.__name__}")
     
     # 1. DECREMENT/DELETE ERRORS FIRST
+    # Batched: one UPDATE over all input ayah_ids, then one DELETE for the
+    # records that reached zero, instead of one SELECT+UPDATE per ayah.
     print(f"LOG: (NEW ORDER) Decrementing frequent errors based on input ayah_ids: {ayah_ids}...")
-    for ayah_id_val in ayah_ids:
-        error_to_decrement = db.query(ErrorModel).filter_by(user_id=user_id, ayah_id=ayah_id_val).first()
-        if error_to_decrement:
-            print(f"LOG: Found error for ayah_id {ayah_id_val} with count {error_to_decrement.error_count}. Decrementing.")
-            error_to_decrement.error_count -= 1
-            if error_to_decrement.error_count <= 0:
-                print(f"LOG: Error count for ayah_id {ayah_id_val} is now <= 0. Deleting error record.")
-                db.delete(error_to_decrement)
+    if ayah_ids:
+        db.query(ErrorModel).filter(
+            ErrorModel.user_id == user_id,
+            ErrorModel.ayah_id.in_(ayah_ids)
+        ).update({ErrorModel.error_count: ErrorModel.error_count - 1}, synchronize_session=False)
+        db.query(ErrorModel).filter(
+            ErrorModel.user_id == user_id,
+            ErrorModel.error_count <= 0
+        ).delete(synchronize_session=False)
     print(f"LOG: (NEW ORDER) Finished decrementing/deleting errors for the input ayah_ids.")
 
     # !!! IMPORTANT FIX: Flush session changes before querying for min_error_ayah_id !!!
     print(f"LOG: Flushing session to ensure error modifications are reflected in subsequent queries.")
     db.flush()
 
-    # 2. GET TOTAL AYAH COUNT FOR THE SURAH
+    # 2. GET TOTAL AYAH COUNT FOR THE SURAH (from the in-process caches)
     if mushaf_id == 1: # Hafs
-        chapter_info_for_total = db.query(Chapters.verses_count).filter(Chapters.id == surah_id).first()
-        total_ayahs = chapter_info_for_total[0] if chapter_info_for_total else 0
-        print(f"LOG: Hafs - Fetched chapter_info_for_total: {chapter_info_for_total}")
+        total_ayahs = get_verse_count_in_chapter(db, surah_id) or 0
+        print(f"LOG: Hafs - total_ayahs from chapter cache: {total_ayahs}")
     else: # Warsh (mushaf_id == 2)
-        warsh_surah_info_for_total = db.query(Warsh.verse_count).filter(Warsh.sura_no == surah_id).first()
-        total_ayahs = warsh_surah_info_for_total[0] if warsh_surah_info_for_total else 0
-        print(f"LOG: Warsh - Fetched warsh_surah_info_for_total: {warsh_surah_info_for_total}")
+        total_ayahs = get_warsh_verse_count(db, surah_id) or 0
+        print(f"LOG: Warsh - total_ayahs from warsh cache: {total_ayahs}")
 
     print(f"LOG: Calculated total_ayahs: {total_ayahs}")
 
@@ -522,80 +664,57 @@ def update_surah_progress(db: Session, user_id: UUID, mushaf_id: int, surah_id:
     min_error_ayah_id_in_surah_range = None
     range_start_id = None 
     range_end_id = None   
-    ayah_range_str = None
+    ayah_range = None
 
-    print(f"LOG: Attempting to fetch Ayah ID range from Chapters table...")
-    chapter_query_for_range = db.query(Chapters.ayah_id_range_hafs, Chapters.ayah_id_range_warsh)
-    
+    print(f"LOG: Reading Ayah ID range from the cached Chapters data...")
     if mushaf_id == 1: # Hafs
-        chapter_details_for_range = chapter_query_for_range.filter(Chapters.id == surah_id).first()
+        chapter_details_for_range = get_chapter_by_id(db, surah_id)
         if chapter_details_for_range:
-            ayah_range_str = chapter_details_for_range.ayah_id_range_hafs
+            ayah_range = chapter_details_for_range.ayah_range_hafs
         print(f"LOG: Hafs - chapter_details_for_range: {chapter_details_for_range}")
     elif mushaf_id == 2: # Warsh
-        chapter_details_for_range = chapter_query_for_range.filter(Chapters.chapter_number == surah_id).first()
+        chapter_details_for_range = get_chapter_by_number(db, surah_id)
         if chapter_details_for_range:
-            ayah_range_str = chapter_details_for_range.ayah_id_range_warsh
+            ayah_range = chapter_details_for_range.ayah_range_warsh
         print(f"LOG: Warsh - chapter_details_for_range: {chapter_details_for_range}")
     
-    print(f"LOG: Fetched ayah_range_str: '{ayah_range_str}'")
-
-    if ayah_range_str: 
-        processed_range_str = ayah_range_str
-        if processed_range_str.startswith('[') and processed_range_str.endswith(']'):
-            processed_range_str = processed_range_str[1:-1]
-            print(f"LOG: Removed brackets, processed_range_str for hyphen check: '{processed_range_str}'")
+    print(f"LOG: Fetched ayah_range: '{ayah_range}'")
+
+    # int4range column (migration 007): Postgres stores the canonical
+    # [lower, upper) form, so the last contained id is upper - 1. No more
+    # Text splitting / int() parsing per call.
+    if ayah_range is not None and ayah_range.lower is not None and ayah_range.upper is not None:
+        range_start_id = ayah_range.lower
+        range_end_id = ayah_range.upper - 1
+        print(f"LOG: Range bounds: range_start_id: {range_start_id}, range_end_id: {range_end_id}")
+
+        print(f"LOG: Querying for min error Ayah ID (post-error-update/flush) in range ({range_start_id}-{range_end_id}) for user_id='{user_id}'...")
+        error_query = db.query(func.min(ErrorModel.ayah_id)).filter(
+            ErrorModel.user_id == user_id,
+            ErrorModel.ayah_id >= range_start_id,
+            ErrorModel.ayah_id <= range_end_id
+        )
+        min_error_ayah_id_result = error_query.scalar() 
+        print(f"LOG: min_error_ayah_id_result (post-error-update/flush) from query: {min_error_ayah_id_result}")
         
-        if '-' in processed_range_str:
-            try:
-                parts = processed_range_str.split('-', 1)
-                if len(parts) == 2:
-                    start_str = parts[0].strip() 
-                    end_str = parts[1].strip()   
-                    range_start_id = int(start_str)
-                    range_end_id = int(end_str)
-                    print(f"LOG: Parsed range_start_id: {range_start_id}, range_end_id: {range_end_id}")
-
-                    print(f"LOG: Querying for min error Ayah ID (post-error-update/flush) in range ({range_start_id}-{range_end_id}) for user_id='{user_id}'...")
-                    error_query = db.query(func.min(ErrorModel.ayah_id)).filter(
-                        ErrorModel.user_id == user_id,
-                        ErrorModel.ayah_id >= range_start_id,
-                        ErrorModel.ayah_id <= range_end_id
-                    )
-                    min_error_ayah_id_result = error_query.scalar() 
-                    print(f"LOG: min_error_ayah_id_result (post-error-update/flush) from query: {min_error_ayah_id_result}")
-                    
-                    if min_error_ayah_id_result is not None:
-                        min_error_ayah_id_in_surah_range = min_error_ayah_id_result
-                else: 
-                    print(f"LOG: Malformed range string (after processing brackets and attempting split, not 2 parts): '{processed_range_str}'")
-            except ValueError as e:
-                print(f"LOG: ValueError parsing numeric range IDs from '{processed_range_str}'. Error: {e}")
-        else:
-            print(f"LOG: No hyphen found in processed_range_str: '{processed_range_str}'. Cannot parse range.")
+        if min_error_ayah_id_result is not None:
+            min_error_ayah_id_in_surah_range = min_error_ayah_id_result
     else:
-        print(f"LOG: ayah_range_str is None or empty. Skipping error check based on range.")
+        print(f"LOG: ayah_range is None or unbounded. Skipping error check based on range.")
         
     print(f"LOG: Final min_error_ayah_id_in_surah_range (boundary, post-error-update/flush): {min_error_ayah_id_in_surah_range}")
 
     # 4. UPDATE AYAH SURAH PROGRESS AND PERCENTAGE
-    print(f"LOG: Fetching or creating progress record for user_id='{user_id}', surah_id={surah_id}...")
-    progress = db.query(ProgressModel).filter_by(user_id=user_id, surah_id=surah_id).first()
-
-    if not progress:
-        print(f"LOG: No existing progress record found. Creating a new one.")
-        progress = ProgressModel(
-            user_id=user_id, 
-            surah_id=surah_id, 
-            ayahs_learned=[],
-            total_ayahs=total_ayahs, 
-            percentage=0 
-        )
-        db.add(progress)
-    else:
-        print(f"LOG: Existing progress record found. Current ayahs_learned: {progress.ayahs_learned}")
-
-    current_learned_set = set(progress.ayahs_learned or [])
+    # One SELECT of just the learned list, then a single
+    # INSERT ... ON CONFLICT DO UPDATE below, instead of the old
+    # fetch-row-then-insert-or-update dance (3 round trips -> 2).
+    print(f"LOG: Fetching current ayahs_learned for user_id='{user_id}', surah_id={surah_id}...")
+    existing_learned = db.query(ProgressModel.ayahs_learned).filter_by(
+        user_id=user_id, surah_id=surah_id
+    ).scalar()
+    print(f"LOG: Existing ayahs_learned: {existing_learned}")
+
+    current_learned_set = set(existing_learned or [])
     print(f"LOG: Initial current_learned_set: {current_learned_set}")
     
     if min_error_ayah_id_in_surah_range is not None:
@@ -612,29 +731,47 @@ def update_surah_progress(db: Session, user_id: UUID, mushaf_id: int, surah_id:
             current_learned_set.add(ayah_id_val)
             print(f"LOG: Adding ayah_id {ayah_id_val} to learned_set (no boundary).")
     
-    updated_ayahs_learned_list = sorted(list(current_learned_set))
+    updated_ayahs_learned_list = sorted(current_learned_set)
     print(f"LOG: Updated ayahs_learned (before saving to DB): {updated_ayahs_learned_list}")
-    progress.ayahs_learned = updated_ayahs_learned_list # type: ignore
-    
-    new_percentage = round((len(progress.ayahs_learned) / total_ayahs) * 100, 2) if total_ayahs > 0 else 0
+
+    new_percentage = round((len(updated_ayahs_learned_list) / total_ayahs) * 100, 2) if total_ayahs > 0 else 0
     print(f"LOG: Calculated new percentage: {new_percentage}%")
-    progress.percentage = new_percentage # type: ignore
-    
-    # 5. COMMIT CHANGES AND UPDATE OVERALL MEMORIZATION
+
+    # 5. UPSERT PROGRESS, COMMIT AND UPDATE OVERALL MEMORIZATION
+    # Single statement handles both first-time insert and update, using the
+    # (user_id, surah_id) primary key as the conflict target.
+    upsert_stmt = pg_insert(ProgressModel).values(
+        user_id=user_id,
+        surah_id=surah_id,
+        ayahs_learned=updated_ayahs_learned_list,
+        total_ayahs=total_ayahs,
+        percentage=new_percentage,
+    ).on_conflict_do_update(
+        index_elements=["user_id", "surah_id"],
+        set_={
+            "ayahs_learned": updated_ayahs_learned_list,
+            "total_ayahs": total_ayahs,
+            "percentage": new_percentage,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(upsert_stmt)
     print(f"LOG: Committing changes to database...")
-    db.commit() 
-    if progress: 
-        db.refresh(progress) # Refresh to get the committed state, especially if DB triggers/defaults exist
-        print(f"LOG: Progress record refreshed. Final ayahs_learned in DB: {progress.ayahs_learned}, Percentage: {progress.percentage}%")
+    db.commit()
+    print(f"LOG: Progress upserted. ayahs_learned: {updated_ayahs_learned_list}, Percentage: {new_percentage}%")
     
     print(f"LOG: Updating overall Quran memorization...")
     update_quran_memorization(db, user_id, mushaf_id)
     
     print(f"--- update_surah_progress END ---\n")
-    return progress
+    return updated_ayahs_learned_list
 
 
 # === Global Memorization ===
+# Total verse counts are constants of the domain: 6236 for Hafs, 6214 for
+# Warsh. No need to re-sum Chapters.verses_count on every progress update.
+GRAND_TOTAL_VERSES = {1: 6236, 2: 6214}
+
 def update_quran_memorization(db: Session, user_id: UUID, mushaf_id: int):
     ProgressModel = HafsSurahProgress if mushaf_id == 1 else WarshSurahProgress
     
@@ -645,20 +782,7 @@ def update_quran_memorization(db: Session, user_id: UUID, mushaf_id: int):
     # Total verses in Quran for the mushaf
     # Hafs: 6236 (standard, excluding Bismillahs except Al-Fatiha)
     # Warsh: Varies slightly by counting method, e.g., 6214.
-    # It's better to sum total_ayahs from all surahs in Chapters table for Hafs,
-    # or derive for Warsh if not readily available as a single number.
-    
-    grand_total_verses = 0
-    if mushaf_id == 1: # Hafs
-        # Sum of verses_count from all Chapters
-        all_chapters_hafs = db.query(Chapters.verses_count).all()
-        grand_total_verses = sum(c[0] for c in all_chapters_hafs if c[0] is not None) # Should be 114 chapters
-    else: # Warsh
-        # Sum of unique verse_count for each sura_no in Warsh table
-        # This is tricky because verse_count is repeated. Need distinct surah verse counts.
-        # A simpler approach might be to use a known total or sum from Chapters if applicable to Warsh counts.
-        # For now, using the provided fixed numbers.
-        grand_total_verses = 6236 if mushaf_id == 1 else 6214 # Using provided totals
+    grand_total_verses = GRAND_TOTAL_VERSES.get(mushaf_id, GRAND_TOTAL_VERSES[1])
 
     overall_percentage = round((total_learned_verses / grand_total_verses) * 100, 2) if grand_total_verses > 0 else 0
 
@@ -673,32 +797,63 @@ def update_quran_memorization(db: Session, user_id: UUID, mushaf_id: int):
 
 
 def get_memorization_percentage(db: Session, user_id: UUID): # Changed user_id to UUID
-    return db.query(QuranMemorization).filter_by(user_id=user_id).first()
+    # Single upsert-and-return: cold users get their zero row created here, so
+    # the endpoint always answers from one statement with no Python fallback
+    # branch. The no-op DO UPDATE makes RETURNING fire for existing rows too.
+    stmt = pg_insert(QuranMemorization).values(
+        user_id=user_id, percentage=0
+    ).on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"user_id": QuranMemorization.user_id},
+    ).returning(QuranMemorization.user_id, QuranMemorization.percentage)
+    row = db.execute(stmt).first()
+    db.commit()
+    return row
 
 # //////////////CHANGE MARIA (Backend CRUD function parameter fix)
 # //////////////CHANGE MARIA (crud.py - Added mushaf_id handling for Surah name)
 def get_surah_name_by_ayah_id(db: Session, ayah_id: int, mushaf_id: int, language_id: int) -> Optional[str]:
     if mushaf_id == 1: # Hafs
-        ayah_model_info = db.query(Ayah.surah_id).filter(Ayah.ayah_index == ayah_id).first()
-        if not ayah_model_info or ayah_model_info.surah_id is None:
-            return None 
-        chapter_info = db.query(Chapters).filter(Chapters.chapter_number == ayah_model_info.surah_id).first()
-        if not chapter_info:
-            chapter_info = db.query(Chapters).filter(Chapters.id == ayah_model_info.surah_id).first()
-            if not chapter_info:
+        # O(1) lookup from the preloaded maps — zero SQL round-trips once warm.
+        if _AYAH_SURAH_ID:
+            surah_id = _AYAH_SURAH_ID.get(ayah_id)
+            if surah_id is None:
                 return None
+            chapter_info = _CHAPTERS_BY_NUMBER.get(surah_id) or _CHAPTERS_BY_ID.get(surah_id)
+        else:
+            ayah_model_info = db.query(Ayah.surah_id).filter(Ayah.ayah_index == ayah_id).first()
+            if not ayah_model_info or ayah_model_info.surah_id is None:
+                return None
+            chapter_info = db.query(Chapters).filter(Chapters.chapter_number == ayah_model_info.surah_id).first()
+            if not chapter_info:
+                chapter_info = db.get(Chapters, ayah_model_info.surah_id)
+        if not chapter_info:
+            return None
         if language_id == 9: return chapter_info.name_arabic
         elif language_id == 38: return chapter_info.name_simple
         else: return None
     elif mushaf_id == 2: # Warsh
-        warsh_verse_info = db.query(Warsh.sura_name_ar, Warsh.sura_name_en).filter(Warsh.id == ayah_id).first()
+        if _WARSH_SURAH_NAMES:
+            warsh_verse_info = _WARSH_SURAH_NAMES.get(ayah_id)
+        else:
+            warsh_verse_info = db.query(Warsh.sura_name_ar, Warsh.sura_name_en).filter(Warsh.id == ayah_id).first()
         if not warsh_verse_info: return None
-        if language_id == 9: return warsh_verse_info.sura_name_ar
-        elif language_id == 38: return warsh_verse_info.sura_name_en
+        if language_id == 9: return warsh_verse_info[0]
+        elif language_id == 38: return warsh_verse_info[1]
         else: return None
     else:
-        return None 
+        return None
 
-def get_random_ayah_from_verse_table(db: Session) -> Optional[Verse]:
-    random_ayah = db.query(Verse).order_by(func.random()).first()
-    return random_ayah
+def get_random_ayah_from_verse_table(db: Session):
+    # The verse table is immutable, so the whole (id, text) pool sits in
+    # memory after startup and a pick is one PRNG call — zero DB round trips.
+    if _RANDOM_AYAH_POOL:
+        return random.choice(_RANDOM_AYAH_POOL)
+    # Cold fallback (scripts / preload failure): pick a random id up to
+    # max(id) and take the first verse at or after it — a single index
+    # probe, never ORDER BY random(). Ids may have gaps, hence >=.
+    max_id = db.query(func.max(Verse.id)).scalar()
+    if not max_id:
+        return None
+    rnd = random.randint(1, max_id)
+    return db.query(Verse.id, Verse.text).filter(Verse.id >= rnd).order_by(Verse.id).first()
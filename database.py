@@ -17,18 +17,33 @@ DBNAME = os.getenv("dbname")
 # Construct the SQLAlchemy connection string
 DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Create the SQLAlchemy engine.
+# Pool tuned for FastAPI concurrency: the default pool_size=5 serializes
+# requests once more than 5 are in flight. pool_pre_ping avoids handing out
+# connections Supabase already dropped, pool_recycle refreshes them before the
+# server-side idle timeout, and LIFO keeps the working set of connections warm.
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=20,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+    query_cache_size=1200,  # Room for every distinct statement the app compiles
+    connect_args={"keepalives": 1, "keepalives_idle": 30},
+)
 # If using Transaction Pooler or Session Pooler, we want to ensure we disable SQLAlchemy client side pooling -
 # https://docs.sqlalchemy.org/en/20/core/pooling.html#switching-pool-implementations
 # engine = create_engine(DATABASE_URL, poolclass=NullPool)
 
-# Test the connection
-try:
-    with engine.connect() as connection:
-        print("Connection successful!")
-except Exception as e:
-    print(f"Failed to connect: {e}")
+# Test the connection (only when run directly: the eager connect blocked app
+# startup and cost one round trip on every import).
+if __name__ == "__main__":
+    try:
+        with engine.connect() as connection:
+            print("Connection successful!")
+    except Exception as e:
+        print(f"Failed to connect: {e}")
 
 # Créer une session locale pour interagir avec la base de données
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
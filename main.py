@@ -1,12 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware  # Add this import
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from routes import surah, juz, mushaf, hizb, search, tafsir, recitation, auth, progress
 from dotenv import load_dotenv
-from fastapi import FastAPI
 from ai import router as ai_router # Assuming ai.py is in the same directory or accessible via Python path
 
 
-app = FastAPI()
+# orjson for everything not already serialized to bytes by a TypeAdapter
+# (single-object responses, plain dict messages): C serializer instead of
+# the stdlib json.dumps that JSONResponse uses.
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -17,18 +21,29 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Compress the large repetitive JSON payloads (verse lists, chapter list)
+# for clients that send Accept-Encoding: gzip; small responses skip it.
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 load_dotenv(dotenv_path=".env")
 
+# Preload the immutable reference data (Chapters/Juzs/Hizbs) into memory once,
+# so those endpoints stop hitting Postgres on every request.
+@app.on_event("startup")
+def preload_reference_data():
+    import crud
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        crud.preload_reference_data(db)
+    except Exception as e:
+        print(f"Failed to preload reference data: {e}")
+    finally:
+        db.close()
+
 # Include the updated routers
-app.include_router(auth.router)
-app.include_router(surah.router)
-app.include_router(juz.router)
-app.include_router(mushaf.router)
-app.include_router(hizb.router)
-app.include_router(search.router)
-app.include_router(tafsir.router)
-app.include_router(recitation.router)
-app.include_router(progress.router)
+for module in (auth, surah, juz, mushaf, hizb, search, tafsir, recitation, progress):
+    app.include_router(module.router)
 # Include the AI endpoint router
 app.include_router(ai_router, prefix="/ai", tags=["AI Recitation Analysis"])
 
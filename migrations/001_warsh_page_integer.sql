@@ -0,0 +1,8 @@
+-- Warsh.page was VARCHAR(10) holding numbers, forcing str() casts in Python
+-- and preventing numeric range scans. Convert it to INTEGER and index it.
+-- Run once against the Supabase database (SQL editor or psql).
+
+ALTER TABLE quran.warsh
+    ALTER COLUMN page TYPE integer USING page::integer;
+
+CREATE INDEX IF NOT EXISTS ix_warsh_page ON quran.warsh (page);
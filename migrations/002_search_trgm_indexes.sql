@@ -0,0 +1,14 @@
+-- Substring search support for the verses / warsh text columns.
+-- The API currently narrows candidates by surah/juz/hizb/page and matches the
+-- normalized text in Python; these GIN trigram indexes let us push a coarse
+-- LIKE/ILIKE prefilter into Postgres (and make any future SQL-side substring
+-- search indexable) without changing the stored data.
+-- Run once against the Supabase database (SQL editor or psql).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS verses_text_simple_trgm
+    ON quran.verse USING gin (text_simple gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS warsh_aya_text_trgm
+    ON quran.warsh USING gin (aya_text gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- get_verses_by_interval filters with
+--   surah = :s AND CAST(split_part(verse_key, ':', 2) AS INT) BETWEEN :a AND :b
+-- This expression index lets the planner satisfy that range directly instead
+-- of scanning every row of the surah and evaluating split_part per row.
+-- Run once against the Supabase database (SQL editor or psql).
+
+CREATE INDEX IF NOT EXISTS verses_surah_ayah
+    ON quran.verse (surah, (CAST(split_part(verse_key, ':', 2) AS INT)));
@@ -0,0 +1,17 @@
+-- Materialize the ayah number that the code kept re-parsing out of
+-- verse_key ("S:V") with split + int() per verse. With a real integer
+-- column the interval queries become plain index range scans and the
+-- Python call sites just read an attribute.
+-- Supersedes the split_part expression index from migration 003.
+-- Run once against the Supabase database (SQL editor or psql).
+
+ALTER TABLE quran.verse ADD COLUMN IF NOT EXISTS ayah_number integer;
+
+UPDATE quran.verse
+SET ayah_number = CAST(split_part(verse_key, ':', 2) AS INT)
+WHERE ayah_number IS NULL AND verse_key LIKE '%:%';
+
+CREATE INDEX IF NOT EXISTS verse_surah_ayah_number
+    ON quran.verse (surah, ayah_number);
+
+DROP INDEX IF EXISTS quran.verses_surah_ayah;
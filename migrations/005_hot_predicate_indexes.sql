@@ -0,0 +1,16 @@
+-- Indexes for the remaining hot WHERE clauses that only had seq scans:
+--   quran.verse.verse_key = ?          (translation / key lookups)
+--   quran.ayah.page_num = ?            (page existence + page verse ranges)
+--   quran.warsh.sura_no = ? AND aya_no (surah-start page lookup, intervals)
+-- Already covered elsewhere, listed for the record:
+--   quran.verse (surah, ayah_number)   -> migration 004
+--   quran.warsh (page)                 -> migration 001
+--   quran.ayah (ayah_index)            -> ayah_index_key unique constraint
+--   hafs/warsh errors + progress       -> composite (user_id, ...) primary keys
+-- Run once against the Supabase database (SQL editor or psql).
+
+CREATE UNIQUE INDEX IF NOT EXISTS verse_verse_key ON quran.verse (verse_key);
+
+CREATE INDEX IF NOT EXISTS ayah_page_num ON quran.ayah (page_num);
+
+CREATE INDEX IF NOT EXISTS warsh_sura_aya ON quran.warsh (sura_no, aya_no);
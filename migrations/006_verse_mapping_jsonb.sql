@@ -0,0 +1,11 @@
+-- Juzs and MushafPages stored verse_mapping as json (raw text, reparsed on
+-- every read) while Hizbs already used jsonb. Align them on jsonb: binary
+-- decomposed storage, faster to process and GIN-indexable if we ever filter
+-- on keys inside the mapping.
+-- Run once against the Supabase database (SQL editor or psql).
+
+ALTER TABLE quran.juzs
+    ALTER COLUMN verse_mapping TYPE jsonb USING verse_mapping::jsonb;
+
+ALTER TABLE quran.mushaf_pages
+    ALTER COLUMN verse_mapping TYPE jsonb USING verse_mapping::jsonb;
@@ -0,0 +1,24 @@
+-- The per-surah ayah id ranges were stored as Text ("1-7" or "[1-7]"),
+-- parsed with split/int in Python on every progress update. Store them as
+-- native int4range instead: Postgres parses once, and a GiST index answers
+-- "which chapter contains ayah X" directly if we ever need that lookup.
+-- The old Text columns are kept untouched for reference.
+-- Run once against the Supabase database (SQL editor or psql).
+
+ALTER TABLE quran.chapters ADD COLUMN IF NOT EXISTS ayah_range_hafs int4range;
+ALTER TABLE quran.chapters ADD COLUMN IF NOT EXISTS ayah_range_warsh int4range;
+
+UPDATE quran.chapters SET ayah_range_hafs = int4range(
+    split_part(trim(both '[]' from ayah_id_range_hafs), '-', 1)::int,
+    split_part(trim(both '[]' from ayah_id_range_hafs), '-', 2)::int,
+    '[]')
+WHERE ayah_id_range_hafs IS NOT NULL AND ayah_id_range_hafs LIKE '%-%';
+
+UPDATE quran.chapters SET ayah_range_warsh = int4range(
+    split_part(trim(both '[]' from ayah_id_range_warsh), '-', 1)::int,
+    split_part(trim(both '[]' from ayah_id_range_warsh), '-', 2)::int,
+    '[]')
+WHERE ayah_id_range_warsh IS NOT NULL AND ayah_id_range_warsh LIKE '%-%';
+
+CREATE INDEX IF NOT EXISTS chapters_ayah_range_hafs ON quran.chapters USING gist (ayah_range_hafs);
+CREATE INDEX IF NOT EXISTS chapters_ayah_range_warsh ON quran.chapters USING gist (ayah_range_warsh);
@@ -0,0 +1,10 @@
+-- GET /progress/errors/{user_id}/{mushaf_id} selects a user's errors ordered
+-- by updated_at DESC; without a matching index Postgres re-sorts per request.
+-- (The request ordering is updated_at, not error_count, hence these columns.)
+-- Run once against the Supabase database (SQL editor or psql).
+
+CREATE INDEX IF NOT EXISTS idx_hafs_errors_user_updated
+    ON public.hafs_errors (user_id, updated_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_warsh_errors_user_updated
+    ON public.warsh_errors (user_id, updated_at DESC);
@@ -0,0 +1,8 @@
+-- Two ayah indexes are fully redundant and only cost write bandwidth:
+--   ayah_surah_id_idx (surah_id)  -- covered by the leading column of the
+--                                    surah_ayah_key (surah_id, ayah_num) unique constraint
+--   "index_quran.ayah_on_ayah_key" (ayah_key) -- ayah_key is the primary key
+-- Run once against the Supabase database (SQL editor or psql).
+
+DROP INDEX IF EXISTS quran.ayah_surah_id_idx;
+DROP INDEX IF EXISTS quran."index_quran.ayah_on_ayah_key";
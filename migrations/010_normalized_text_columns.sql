@@ -0,0 +1,33 @@
+-- Move the Arabic normalization that crud.py applied per row at query time
+-- (diacritic strip, dagger-alif/alif-wasla folding, tatweel removal, space
+-- collapse) into an IMMUTABLE SQL function, materialize it as a generated
+-- column on both mushaf tables, and index it with trigrams. Search then
+-- becomes one indexable LIKE instead of a Python scan over every candidate.
+-- Supersedes the raw-text trigram indexes from migration 002.
+-- Run once against the Supabase database (SQL editor or psql).
+
+CREATE OR REPLACE FUNCTION quran.normalize_ar(input text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT btrim(regexp_replace(
+        translate(
+            regexp_replace(input,
+                E'[\\u064B-\\u065F\\u06D6-\\u06DC\\u06DF-\\u06E8\\u06EA-\\u06ED]',
+                '', 'g'),
+            U&'\0670\0671\0640', U&'\0627\0627'),
+        E'\\s+', ' ', 'g'))
+$$;
+
+ALTER TABLE quran.verse ADD COLUMN IF NOT EXISTS text_norm text
+    GENERATED ALWAYS AS (quran.normalize_ar(text)) STORED;
+
+ALTER TABLE quran.warsh ADD COLUMN IF NOT EXISTS text_norm text
+    GENERATED ALWAYS AS (quran.normalize_ar(aya_text)) STORED;
+
+CREATE INDEX IF NOT EXISTS verse_text_norm_trgm
+    ON quran.verse USING gin (text_norm gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS warsh_text_norm_trgm
+    ON quran.warsh USING gin (text_norm gin_trgm_ops);
+
+DROP INDEX IF EXISTS quran.verses_text_simple_trgm;
+DROP INDEX IF EXISTS quran.warsh_aya_text_trgm;
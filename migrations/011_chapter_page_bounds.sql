@@ -0,0 +1,18 @@
+-- chapters.pages stores the page span as a "first-last" string (e.g. "1-7"),
+-- which clients have to re-parse and which no query can use. Materialize the
+-- two bounds as integer columns; the text column stays for compatibility.
+-- Run once against the Supabase database (SQL editor or psql).
+
+ALTER TABLE quran.chapters ADD COLUMN IF NOT EXISTS first_page integer;
+ALTER TABLE quran.chapters ADD COLUMN IF NOT EXISTS last_page integer;
+
+UPDATE quran.chapters
+SET first_page = CAST(split_part(pages, '-', 1) AS INT),
+    last_page  = CAST(split_part(pages, '-', 2) AS INT)
+WHERE first_page IS NULL AND pages LIKE '%-%';
+
+-- Single-page surahs may be stored without a dash ("604").
+UPDATE quran.chapters
+SET first_page = CAST(pages AS INT),
+    last_page  = CAST(pages AS INT)
+WHERE first_page IS NULL AND pages ~ '^[0-9]+$';
@@ -0,0 +1,14 @@
+-- The verse text columns are conceptually never NULL (every ayah has text),
+-- but without the constraint every consumer had to guard with `or ""`.
+-- Enforce NOT NULL with an empty-string default so the guards can go away.
+-- Run once against the Supabase database (SQL editor or psql).
+
+UPDATE quran.verse SET text = '' WHERE text IS NULL;
+ALTER TABLE quran.verse
+    ALTER COLUMN text SET DEFAULT '',
+    ALTER COLUMN text SET NOT NULL;
+
+UPDATE quran.warsh SET aya_text = '' WHERE aya_text IS NULL;
+ALTER TABLE quran.warsh
+    ALTER COLUMN aya_text SET DEFAULT '',
+    ALTER COLUMN aya_text SET NOT NULL;
@@ -1,9 +1,8 @@
 from typing import List, Optional
 
-from sqlalchemy import ARRAY, TIMESTAMP, BigInteger, Boolean, Column, ForeignKeyConstraint, Index, Integer, JSON, PrimaryKeyConstraint, String, Table, Text, UniqueConstraint, text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import ARRAY, TIMESTAMP, BigInteger, Boolean, Column, Computed, ForeignKeyConstraint, Index, Integer, JSON, PrimaryKeyConstraint, String, Table, Text, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import INT4RANGE, JSONB, Range
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID  # at the top
 
@@ -35,11 +34,19 @@ class Chapters(Base):
     name_arabic: Mapped[Optional[str]] = mapped_column(String)
     name_simple: Mapped[Optional[str]] = mapped_column(String)
     pages: Mapped[Optional[str]] = mapped_column(String)
+    # Integer page bounds split out of the "first-last" string (migration 011),
+    # so clients stop re-parsing it and queries can compare pages directly.
+    first_page: Mapped[Optional[int]] = mapped_column(Integer)
+    last_page: Mapped[Optional[int]] = mapped_column(Integer)
     verses_count: Mapped[Optional[int]] = mapped_column(Integer)
     chapter_number: Mapped[Optional[int]] = mapped_column(Integer)
     hizbs_count: Mapped[Optional[int]] = mapped_column(Integer)
     ayah_id_range_hafs: Mapped[Optional[str]] = mapped_column(Text)
     ayah_id_range_warsh: Mapped[Optional[str]] = mapped_column(Text)
+    # Native ranges (migration 007), parsed once by Postgres instead of
+    # splitting the Text form in Python on every progress update.
+    ayah_range_hafs: Mapped[Optional[Range]] = mapped_column(INT4RANGE)
+    ayah_range_warsh: Mapped[Optional[Range]] = mapped_column(INT4RANGE)
 
 
 class Hizbs(Base):
@@ -72,7 +79,7 @@ class Juzs(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     juz_number: Mapped[Optional[int]] = mapped_column(Integer)
-    verse_mapping: Mapped[Optional[dict]] = mapped_column(JSON)
+    verse_mapping: Mapped[Optional[dict]] = mapped_column(JSONB)  # jsonb since migration 006
     first_verse_id: Mapped[Optional[int]] = mapped_column(Integer)
     last_verse_id: Mapped[Optional[int]] = mapped_column(Integer)
     verses_count: Mapped[Optional[int]] = mapped_column(Integer)
@@ -89,7 +96,7 @@ class MushafPages(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     page_number: Mapped[Optional[int]] = mapped_column(Integer)
-    verse_mapping: Mapped[Optional[dict]] = mapped_column(JSON)
+    verse_mapping: Mapped[Optional[dict]] = mapped_column(JSONB)  # jsonb since migration 006
     first_verse_id: Mapped[Optional[int]] = mapped_column(Integer)
     last_verse_id: Mapped[Optional[int]] = mapped_column(Integer)
     verses_count: Mapped[Optional[int]] = mapped_column(Integer)
@@ -147,8 +154,7 @@ class Ayah(Base):
         PrimaryKeyConstraint('ayah_key', name='ayah_pkey'),
         UniqueConstraint('ayah_index', name='ayah_index_key'),
         UniqueConstraint('surah_id', 'ayah_num', name='surah_ayah_key'),
-        Index('ayah_surah_id_idx', 'surah_id'),
-        Index('index_quran.ayah_on_ayah_key', 'ayah_key'),
+        Index('ayah_page_num', 'page_num'),  # Added by migration 005
         {'schema': 'quran'}
     )
 
@@ -214,14 +220,9 @@ class Tafsirs(Base):
     page_number: Mapped[Optional[int]] = mapped_column(Integer)
 
 
-Base = declarative_base()
-
-from sqlalchemy import Column, Integer, Text
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
-
+# Translation and Verse used to live on their own declarative_base(),
+# which split the metadata into three registries and defeated the
+# compiled-statement cache. They now share the single Base above.
 class Translation(Base):
     __tablename__ = 'translation'
     __table_args__ = {'schema': 'quran'}
@@ -240,9 +241,13 @@ class Verse(Base):
 
     id = Column(Integer, primary_key=True)
     verse_key = Column(Text)
-    text = Column(Text)
+    # NOT NULL DEFAULT '' since migration 012: callers need no None guard
+    text = Column(Text, nullable=False, server_default=text("''"))
     text_simple = Column(Text)
     surah = Column(Integer)
+    ayah_number = Column(Integer)  # Populated by migration 004 from verse_key
+    # Pre-normalized text for search (generated column, migration 010)
+    text_norm = Column(Text, Computed("quran.normalize_ar(text)", persisted=True))
 
 
 class VersePages(Base):
@@ -265,26 +270,35 @@ class Warsh(Base):
     __tablename__ = 'warsh'
     __table_args__ = (
         PrimaryKeyConstraint('id', name='warsh_pkey'),
+        Index('ix_warsh_page', 'page'),
         {'schema': 'quran'}
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     jozz: Mapped[Optional[int]] = mapped_column(Integer)
-    page: Mapped[Optional[str]] = mapped_column(String(10))
+    # Integer since migrations/001_warsh_page_integer.sql (was VARCHAR(10))
+    page: Mapped[Optional[int]] = mapped_column(Integer)
     sura_no: Mapped[Optional[int]] = mapped_column(Integer)
     sura_name_en: Mapped[Optional[str]] = mapped_column(String(255))
     sura_name_ar: Mapped[Optional[str]] = mapped_column(Text)
     line_start: Mapped[Optional[int]] = mapped_column(Integer)
     line_end: Mapped[Optional[int]] = mapped_column(Integer)
     aya_no: Mapped[Optional[int]] = mapped_column(Integer)
-    aya_text: Mapped[Optional[str]] = mapped_column(Text)
+    # NOT NULL DEFAULT '' since migration 012: callers need no None guard
+    aya_text: Mapped[str] = mapped_column(Text, nullable=False, server_default=text("''"))
     text_simple: Mapped[Optional[str]] = mapped_column(Text)
+    # Pre-normalized text for search (generated column, migration 010)
+    text_norm: Mapped[Optional[str]] = mapped_column(Text, Computed('quran.normalize_ar(aya_text)', persisted=True))
     verse_count: Mapped[Optional[int]] = mapped_column(Integer)
 
 # === Frequent Errors Tables ===
 class HafsError(Base):
     __tablename__ = "hafs_errors"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        # Matches the errors endpoint: WHERE user_id = ? ORDER BY updated_at DESC
+        Index('idx_hafs_errors_user_updated', 'user_id', text('updated_at DESC')),
+        {"schema": "public"},
+    )
 
     user_id = Column(UUID(as_uuid=True), primary_key=True)
     ayah_id = Column(Integer, primary_key=True)
@@ -295,7 +309,10 @@ class HafsError(Base):
 
 class WarshError(Base):
     __tablename__ = "warsh_errors"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index('idx_warsh_errors_user_updated', 'user_id', text('updated_at DESC')),
+        {"schema": "public"},
+    )
 
     user_id = Column(UUID(as_uuid=True), primary_key=True)
     ayah_id = Column(Integer, primary_key=True)
@@ -6,7 +6,9 @@ model_name = "tarteel-ai/whisper-base-ar-quran"
 print(f"Attempting to download/cache model: {model_name}")
 try:
     processor = WhisperProcessor.from_pretrained(model_name)
-    model = WhisperForConditionalGeneration.from_pretrained(model_name)
+    # low_cpu_mem_usage keeps the Docker build from allocating the weights
+    # twice; the runtime dtype (FP16 on GPU) is chosen at load in ai.py.
+    model = WhisperForConditionalGeneration.from_pretrained(model_name, low_cpu_mem_usage=True)
     print(f"Successfully pre-loaded model and processor for {model_name}")
 except Exception as e:
     print(f"Error pre-loading model: {e}")
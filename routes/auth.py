@@ -6,18 +6,18 @@ from database import get_db
 from models import AppUser  # Ajouté pour vérifier l'existence par ID
 from supabase import create_client, Client
 from dotenv import load_dotenv
+import logging
 import os
 from schemas import ForgotPasswordRequest  # Add this if not present
 
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-print("SUPABASE_URL =", SUPABASE_URL)
-print("SUPABASE_KEY =", SUPABASE_KEY[:10], "...")
-
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 router = APIRouter()
@@ -52,7 +52,8 @@ def signup_user(payload: UserCreate, db: Session = Depends(get_db)):
     user_id = data["user"]["id"]
 
     # Vérifier si cet utilisateur existe déjà dans la base locale
-    existing_user = db.query(AppUser).filter(AppUser.id == user_id).first()
+    # (SELECT EXISTS : pas besoin d'hydrater la ligne complète)
+    existing_user = db.query(db.query(AppUser).filter(AppUser.id == user_id).exists()).scalar()
     if existing_user:
         raise HTTPException(status_code=400, detail="User already exists in local database.")
 
@@ -72,18 +73,16 @@ def signup_user(payload: UserCreate, db: Session = Depends(get_db)):
 
 @router.post("/login")
 def login_user(payload: UserLogin, db: Session = Depends(get_db)):
-    # Get the user from the local database by username
-    user = db.query(AppUser).filter(AppUser.username == payload.username).first()
+    # Get the user's email from the local database by username
+    # (colonne seule : on n'a besoin que de l'email, pas de tout l'objet)
+    email = db.query(AppUser.email).filter(AppUser.username == payload.username).scalar()
 
-    if not user:
+    if not email:
         raise HTTPException(status_code=400, detail="Invalid username")
 
-    email = user.email
-
-    print("LOGIN ATTEMPT")
-    print("Username:", payload.username)
-    print("Fetched email:", email)
-    print("Password:", payload.password)
+    # Jamais de mot de passe ni de clé dans les logs ; debug-only et hors du
+    # chemin chaud (pas de flush stdout par requête).
+    logger.debug("login attempt user=%s", payload.username)
 
     # Attempt login via Supabase Auth using email/password
     response = supabase.auth.sign_in_with_password({
@@ -133,17 +132,18 @@ def update_user(user_id: str, update_data: UserUpdate, db: Session = Depends(get
 
 @router.get("/mushaf/{user_id}", response_model=int)
 def get_user_mushaf(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(AppUser).filter(AppUser.id == user_id).first()
-    if not user:
+    # Colonne seule : un seul int sur le réseau au lieu de la ligne complète
+    row = db.query(AppUser.mushaf_id).filter(AppUser.id == user_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
-    return user.mushaf_id
+    return row[0]
 
 @router.get("/userid/{username}", response_model=str)
 def get_user_id_by_username(username: str, db: Session = Depends(get_db)):
-    user = get_user_by_username(db, username)
-    if not user:
+    user_id = db.query(AppUser.id).filter(AppUser.username == username).scalar()
+    if not user_id:
         raise HTTPException(status_code=404, detail="User not found")
-    return str(user.id)  # ✅ Cast explicite vers str
+    return str(user_id)  # ✅ Cast explicite vers str
 
 from uuid import UUID
 from sqlalchemy.exc import SQLAlchemyError
@@ -151,22 +151,27 @@ from fastapi import status
 
 @router.delete("/delete-user/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(user_id: UUID, db: Session = Depends(get_db)):
-    # Step 1: Delete from Supabase Auth
+    # Step 1: Delete from local public.users table (AppUser) first, without
+    # committing : si Supabase échoue ensuite, on rollback au lieu de laisser
+    # un compte Auth supprimé avec une ligne locale orpheline.
     try:
-        supabase.auth.admin.delete_user(str(user_id))  # Supabase needs a string
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Supabase Auth deletion failed: {str(e)}")
-
-    # Step 2: Delete from local public.users table (AppUser)
-    try:
-        user = db.query(AppUser).filter(AppUser.id == user_id).first()
-        if user:
-            db.delete(user)
-            db.commit()
-        else:
-            raise HTTPException(status_code=404, detail="User not found in local DB")
+        # Un seul DELETE au lieu de fetch-puis-delete ; rowcount dit si la
+        # ligne existait.
+        deleted = db.query(AppUser).filter(AppUser.id == user_id).delete(synchronize_session=False)
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database deletion failed: {str(e)}")
 
+    if not deleted:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User not found in local DB")
+
+    # Step 2: Delete from Supabase Auth, puis commit du delete local.
+    try:
+        supabase.auth.admin.delete_user(str(user_id))  # Supabase needs a string
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Supabase Auth deletion failed: {str(e)}")
+
+    db.commit()
     return {"detail": "User deleted successfully from Auth and local DB"}
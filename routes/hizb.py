@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from database import get_db
 import crud
@@ -9,10 +9,19 @@ router = APIRouter(
     tags=["Hizbs"]
 )
 
+# Comme pour les sourates : liste immuable, sérialisée une seule fois via
+# l'adaptateur de schemas.py, puis les mêmes octets à chaque requête.
+_HIZBS_JSON: bytes = b""
+
 # Liste de tous les Hizbs
 @router.get("/", response_model=list[schemas.HizbOut])
 def get_all_hizbs(db: Session = Depends(get_db)):
-    return crud.get_all_hizbs(db)
+    global _HIZBS_JSON
+    if not _HIZBS_JSON:
+        hizbs = schemas.HizbListAdapter.validate_python(
+            crud.get_all_hizbs(db), from_attributes=True)
+        _HIZBS_JSON = schemas.HizbListAdapter.dump_json(hizbs)
+    return Response(content=_HIZBS_JSON, media_type="application/json")
 
 
 # Obtenir la page de début d'un Hizb via son first_verse_id
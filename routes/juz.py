@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from database import get_db
 import crud
@@ -9,10 +9,19 @@ router = APIRouter(
     tags=["Juzs"]
 )
 
+# Comme pour les sourates : liste immuable, sérialisée une seule fois via
+# l'adaptateur de schemas.py, puis les mêmes octets à chaque requête.
+_JUZS_JSON: bytes = b""
+
 # Liste de tous les Juzs
 @router.get("/", response_model=list[schemas.JuzOut])
 def get_all_juzs(db: Session = Depends(get_db)):
-    return crud.get_all_juzs(db)
+    global _JUZS_JSON
+    if not _JUZS_JSON:
+        juzs = schemas.JuzListAdapter.validate_python(
+            crud.get_all_juzs(db), from_attributes=True)
+        _JUZS_JSON = schemas.JuzListAdapter.dump_json(juzs)
+    return Response(content=_JUZS_JSON, media_type="application/json")
 
 
 # Obtenir la page de début d'un Juz via son first_verse_id
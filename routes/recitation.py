@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from database import get_db
 import crud
@@ -30,11 +30,20 @@ def validate_interval(data: schemas.RecitationIntervalIn, db: Session = Depends(
 
 
 # Récupère les versets à réciter dans l'intervalle Hafs ou warsh
+# La liste est homogène par requête (ça dépend du mushaf_id) : on passe par
+# l'adaptateur du bon variant au lieu de laisser le response_model essayer
+# l'union VerseOut/WarshVerseOut ligne par ligne (smart union = O(variants)
+# par élément). Une seule décision par requête, validation + dump en Rust.
 @router.post("/interval", response_model=List[Union[schemas.VerseOut, schemas.WarshVerseOut]])
 def get_recitation_verses(data: schemas.RecitationIntervalIn, db: Session = Depends(get_db)):
     if data.mushaf_id == 1:
-        return crud.get_verses_by_interval(db, data.surah_id, data.from_verse, data.to_verse)
+        verses = crud.get_verses_by_interval(db, data.surah_id, data.from_verse, data.to_verse)
+        adapter = schemas.VerseListAdapter
     elif data.mushaf_id == 2:
-        return crud.get_warsh_by_interval(db, data.surah_id, data.from_verse, data.to_verse)
+        verses = crud.get_warsh_by_interval(db, data.surah_id, data.from_verse, data.to_verse)
+        adapter = schemas.WarshVerseListAdapter
     else:
         raise HTTPException(status_code=400, detail="Invalid mushaf_id. Use 1 for Hafs or 2 for Warsh.")
+    return Response(content=adapter.dump_json(
+        adapter.validate_python(verses, from_attributes=True)
+    ), media_type="application/json")
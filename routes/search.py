@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
 from sqlalchemy.orm import Session
 from database import get_db
 import crud # crud.py now contains normalize_arabic_quranic_text_for_comparison
@@ -17,6 +17,8 @@ def new_complex_search(
     surah: Optional[int] = Query(None, ge=1, le=114, description="Surah number (1-114). Example: 1"),
     page: Optional[int] = Query(None, ge=1, le=604, description="Page number. Example: 2"), # Max page can vary
     verse_number: Optional[int] = Query(None, ge=1, description="Verse number within a surah. Example: 1"), # Max verse varies
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results per call."),
+    after_verse_id: Optional[int] = Query(None, description="Keyset cursor: return only verses with id greater than this (use the last verse_id of the previous page)."),
     db: Session = Depends(get_db)
 ):
     """
@@ -42,12 +44,14 @@ def new_complex_search(
         page_num_from_surah = crud.get_page_for_surah(db, mushaf_id=mushaf_id, surah_number=surah)
         if page_num_from_surah is None:
             raise HTTPException(status_code=404, detail=f"Could not determine starting page for Surah {surah} in Mushaf {mushaf_id}.")
-        return schemas.PageInfoResponse(page_number=page_num_from_surah)
+        # model_construct: valeurs générées côté serveur, types déjà corrects —
+        # inutile de repayer la validation Pydantic à la construction.
+        return schemas.PageInfoResponse.model_construct(page_number=page_num_from_surah)
 
     if page is not None and text is None and surah is None and verse_number is None:
         if not crud.check_page_exists(db, mushaf_id=mushaf_id, page_number=page):
             raise HTTPException(status_code=404, detail=f"Page {page} not found or is invalid for Mushaf {mushaf_id}.")
-        return schemas.PageInfoResponse(page_number=page)
+        return schemas.PageInfoResponse.model_construct(page_number=page)
 
     # --- Logic for searching Ayahs ---
     # User's 'text' is passed directly to crud.search_verses_complex
@@ -59,7 +63,9 @@ def new_complex_search(
         user_query_text=text, # Pass raw user text
         surah_id=surah,
         page_number=page,
-        verse_num=verse_number
+        verse_num=verse_number,
+        limit=limit,
+        after_verse_id=after_verse_id
     )
 
     if not ayat_data:
@@ -67,20 +73,19 @@ def new_complex_search(
         # (Error messages can be refined based on which specific combination led to no results)
         raise HTTPException(status_code=404, detail=detail_message)
 
-    response_list = []
-    for verse_obj in ayat_data:
-        ayah_text_content = ""
-        verse_id_val = 0
-        if mushaf_id == 1: # Hafs (models.Verse)
-            ayah_text_content = verse_obj.text if verse_obj.text is not None else "" # Original text
-            verse_id_val = verse_obj.id
-        elif mushaf_id == 2: # Warsh (models.Warsh)
-            ayah_text_content = verse_obj.aya_text if verse_obj.aya_text is not None else "" # Original text
-            verse_id_val = verse_obj.id
-        
-        response_list.append(schemas.AyahResult(verse_id=verse_id_val, text=ayah_text_content))
-        
-    return response_list
+    # The whole result list goes through the module-level adapter in one
+    # Rust-core pass (validate + dump to bytes), instead of FastAPI's
+    # per-request response_model machinery and jsonable_encoder.
+    # Page numbers come from one batch lookup, not one query per result.
+    # Text columns are NOT NULL since migration 012, no None guard needed.
+    pages = crud.get_pages_for_verse_ids(db, mushaf_id, [v.id for v in ayat_data])
+    if mushaf_id == 1: # Hafs (models.Verse)
+        rows = [{"verse_id": v.id, "text": v.text, "page_number": pages.get(v.id)} for v in ayat_data]
+    else: # Warsh (models.Warsh)
+        rows = [{"verse_id": v.id, "text": v.aya_text, "page_number": pages.get(v.id)} for v in ayat_data]
+    return Response(content=schemas.AyahResultListAdapter.dump_json(
+        schemas.AyahResultListAdapter.validate_python(rows)
+    ), media_type="application/json")
 
 
 @router.get("/page/{verse_id}", response_model=schemas.PageInfoResponse,
@@ -94,7 +99,7 @@ def get_page_number_for_verse(
     page_num = crud.get_page_from_verse_id(db, mushaf_id=mushaf_id, verse_id=verse_id)
     if page_num is None:
         raise HTTPException(status_code=404, detail=f"Verse with ID {verse_id} not found in Mushaf {mushaf_id}, or page info unavailable.")
-    return schemas.PageInfoResponse(page_number=page_num)
+    return schemas.PageInfoResponse.model_construct(page_number=page_num)
 
 # +++ NEW ENDPOINT: AYAH ID TO SURAH NAME (same as before) +++
 # //////////////CHANGE MARIA (search.py - Added mushaf_id to endpoint)
@@ -120,7 +125,7 @@ def get_surah_name_for_ayah(
             status_code=404, 
             detail=f"Could not find Surah name for Ayah ID {ayah_id} in Mushaf {mushaf_id} with language ID {language_id}."
         )
-    return schemas.SurahNameResponse(surah_name=surah_name)
+    return schemas.SurahNameResponse.model_construct(surah_name=surah_name)
 
 # +++ NEW ENDPOINT: RANDOM AYAH (same as before) +++
 @router.get("/random-ayah/", response_model=schemas.RandomAyahResponse,
@@ -130,4 +135,4 @@ def get_random_ayah(db: Session = Depends(get_db)):
     random_ayah_obj = crud.get_random_ayah_from_verse_table(db)
     if not random_ayah_obj:
         raise HTTPException(status_code=404, detail="Could not retrieve a random Ayah.")
-    return schemas.RandomAyahResponse(id=random_ayah_obj.id, text=random_ayah_obj.text or "")
+    return schemas.RandomAyahResponse.model_construct(id=random_ayah_obj.id, text=random_ayah_obj.text)
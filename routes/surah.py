@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from database import get_db
 import crud
@@ -9,10 +9,19 @@ router = APIRouter(
     tags=["Chapters"]
 )
 
+# La liste des sourates est immuable : on sérialise une seule fois et on
+# renvoie les mêmes octets à chaque requête (plus d'ORM ni de Pydantic par
+# appel). response_model reste déclaré pour la doc OpenAPI.
+_CHAPTERS_JSON: bytes = b""
+
 # Obtenir la liste de toutes les sourates
 @router.get("/", response_model=list[schemas.ChapterOut])
 def get_all_chapters(db: Session = Depends(get_db)):
-    return crud.get_all_chapters(db)
+    global _CHAPTERS_JSON
+    if not _CHAPTERS_JSON:
+        chapters = [schemas.ChapterOut.model_validate(c) for c in crud.get_all_chapters(db)]
+        _CHAPTERS_JSON = schemas.ChapterListAdapter.dump_json(chapters)
+    return Response(content=_CHAPTERS_JSON, media_type="application/json")
 
 
 # Obtenir les détails d'une sourate par ID
@@ -1,10 +1,29 @@
 import datetime
-from datetime import datetime as dt 
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List, Union
+from datetime import datetime as dt
+from pydantic import BaseModel, ConfigDict, Field, NaiveDatetime, StringConstraints, TypeAdapter
+from typing import Annotated, Optional, List, Union
 from uuid import UUID
 
 
+# Deliberately loose email check: one Rust-level regex instead of the
+# email-validator package's Python parse on every signup/update/reset body.
+# Shape-only (something@something.tld), lowercased and trimmed — Supabase does
+# the real verification when it sends mail.
+EmailLike = Annotated[str, StringConstraints(
+    pattern=r'^[^@\s]+@[^@\s]+\.[^@\s]+$', max_length=254,
+    to_lower=True, strip_whitespace=True)]
+
+# For ids that are only ever DB keys: a shape-checked string, no uuid.UUID
+# object built per request (psycopg2 binds the string to uuid columns
+# directly, same as the GET endpoints' path params).
+UUIDStr = Annotated[str, StringConstraints(
+    min_length=36, max_length=36, pattern=r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')]
+
+# Identifiants trimés champ par champ — jamais sur le modèle entier, pour ne
+# pas toucher aux mots de passe (credentials opaques, transmis tels quels).
+TrimmedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+
+
 class UserOut(BaseModel):
     id: UUID
     username: str
@@ -12,26 +31,36 @@ class UserOut(BaseModel):
     phone: str
     mushaf_id: int
 
-    class Config:
-        from_attributes = True
+    # strict=True: the ORM already hands over real UUID/int/str values, so the
+    # validator takes the exact-type fast path instead of lax coercion.
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore', strict=True)
 
 class UserCreate(BaseModel):
-    username: str
-    email: EmailStr
-    phone: str
-    password: str
+    username: TrimmedStr
+    email: EmailLike
+    phone: TrimmedStr
+    password: str  # verbatim : le strip casserait les mots de passe à espaces
     mushaf_id: int
 
+    # Entrées : refuse les champs inconnus ; le trim se fait par champ.
+    model_config = ConfigDict(extra='forbid')
+
 class UserLogin(BaseModel):
-    username: str
-    password: str
+    username: TrimmedStr
+    password: str  # verbatim : le strip casserait les mots de passe à espaces
+
+    # Entrées : refuse les champs inconnus ; le trim se fait par champ.
+    model_config = ConfigDict(extra='forbid')
 
 
 class UserUpdate(BaseModel):
-    username: Optional[str] = None
-    email: Optional[EmailStr] = None
-    phone: Optional[str] = None
-    password: Optional[str] = None
+    username: Optional[TrimmedStr] = None
+    email: Optional[EmailLike] = None
+    phone: Optional[TrimmedStr] = None
+    password: Optional[str] = None  # verbatim, comme à la création
+
+    # Entrées : refuse les champs inconnus ; le trim se fait par champ.
+    model_config = ConfigDict(extra='forbid')
 
 
 
@@ -42,10 +71,15 @@ class ChapterOut(BaseModel):
     name_simple: Optional[str] = None
     name_arabic: Optional[str] = None
     pages: Optional[str] = None # This seems to be a string representing a range e.g. "1-7"
+    first_page: Optional[int] = None # Parsed bounds of the pages string (migration 011)
+    last_page: Optional[int] = None
     verses_count: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+# Reusable serializer for the immutable chapter list (see routes/surah.py)
+ChapterListAdapter = TypeAdapter(List[ChapterOut])
 
 
 # === Hizb ===
@@ -56,8 +90,10 @@ class HizbOut(BaseModel):
     last_verse_id: Optional[int] = None
     verses_count: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+HizbListAdapter = TypeAdapter(List[HizbOut])
 
 
 # === Juz ===
@@ -68,8 +104,10 @@ class JuzOut(BaseModel):
     last_verse_id: Optional[int] = None
     verses_count: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+JuzListAdapter = TypeAdapter(List[JuzOut])
 
 
 # === Verse (Original schemas - can be reused or adapted) ===
@@ -80,34 +118,46 @@ class VerseOut(BaseModel):
     text_simple: Optional[str] = None
     surah: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+# Built once at import: FastAPI's response_model machinery re-derives the
+# list validator per route, these adapters serialize straight to bytes.
+VerseListAdapter = TypeAdapter(List[VerseOut])
 
 
 # === Warsh Verse (Original schemas - can be reused or adapted) ===
 class WarshVerseOut(BaseModel):
     id: int
     jozz: Optional[int] = None
-    page: Optional[str] = None
+    page: Optional[int] = None # Integer column since migration 001
     sura_no: Optional[int] = None
     sura_name_ar: Optional[str] = None
     aya_no: Optional[int] = None
-    aya_text: Optional[str] = None
+    aya_text: str  # NOT NULL DEFAULT '' since migration 012
     text_simple: Optional[str] = None
     verse_count: Optional[int] = None
 
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+WarshVerseListAdapter = TypeAdapter(List[WarshVerseOut])
 
 # === SEARCH RELATED SCHEMAS ===
 
 class AyahResult(BaseModel): # Specifically for search results
     verse_id: int
     text: str 
+    page_number: Optional[int] = None # Filled in batch by the search route
+
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+# One Rust-core pass validates and dumps the whole result list (see
+# routes/search.py); built once here like the other list adapters.
+AyahResultListAdapter = TypeAdapter(List[AyahResult])
 
-    class Config:
-        from_attributes = True
 
 class PageInfoResponse(BaseModel):
     page_number: int
@@ -122,8 +172,7 @@ class MushafPageOut(BaseModel):
     first_verse_id: Optional[int] = None
     last_verse_id: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 # === Tafsir ===
@@ -133,9 +182,7 @@ class TafsirOut(BaseModel):
     language_id: Optional[int] = None
     text_: Optional[str] = Field(None, alias="text") # Alias if your DB field is 'text'
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True, frozen=True, extra='ignore')
 
 
 # === Translation ===
@@ -146,8 +193,7 @@ class TranslationOut(BaseModel):
     ayah_key: Optional[str] = None
     text: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 
@@ -158,8 +204,7 @@ class VersePageOut(BaseModel):
     page_id: Optional[int] = None
     page_number: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 # === Recitation Interval Input ===
@@ -169,12 +214,20 @@ class RecitationIntervalIn(BaseModel):
     to_verse: int
     mushaf_id: int
 
+    # Entrées : refuse les champs inconnus et normalise les espaces en Rust.
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+
 
 # === Frequent Errors Input ===
 class FrequentErrorIn(BaseModel):
-    user_id: UUID
+    user_id: UUIDStr  # clé DB uniquement, jamais manipulée comme UUID
     mushaf_id: int
-    ayah_ids: List[int]
+    # Contrainte inline exécutée en Rust : éléments strictement int, taille
+    # bornée au nombre total d'ayahs (6236).
+    ayah_ids: Annotated[list[int], Field(strict=True, max_length=6236)]
+
+    # Entrées : refuse les champs inconnus et normalise les espaces en Rust.
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
 
 
 # === Frequent Errors Output ===
@@ -182,41 +235,42 @@ class FrequentErrorOut(BaseModel):
     ayah_id: int
     text: str
     error_count: int
-    created_at: Optional[dt] = None
-    updated_at: Optional[dt] = None
+    # Colonnes TIMESTAMP sans fuseau : datetimes naïfs, sérialisés ISO-8601
+    # directement par pydantic-core.
+    created_at: Optional[NaiveDatetime] = None
+    updated_at: Optional[NaiveDatetime] = None
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            dt: lambda v: v.isoformat() if v else None
-        }
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 
 # === Surah Progress Input ===
 class SurahProgressIn(BaseModel):
-    user_id: UUID
+    user_id: UUIDStr  # clé DB uniquement, jamais manipulée comme UUID
     mushaf_id: int
     surah_id: int
-    ayah_ids: List[int]
+    # Contrainte inline exécutée en Rust : éléments strictement int, taille
+    # bornée au nombre total d'ayahs (6236).
+    ayah_ids: Annotated[list[int], Field(strict=True, max_length=6236)]
     # created_at and updated_at are usually handled by the DB or server, not input
     # created_at: Optional[str] = None
     # updated_at: Optional[str] = None
 
+    # Entrées : refuse les champs inconnus et normalise les espaces en Rust.
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+
 
 # === Surah Progress Output ===
 class SurahProgressOut(BaseModel):
     surah_id: int
     surah_name: str # You'll need to fetch this in your route/crud
     percentage: float
-    created_at: Optional[dt] = None
-    updated_at: Optional[dt] = None
+    # Colonnes TIMESTAMP sans fuseau : datetimes naïfs, sérialisés ISO-8601
+    # directement par pydantic-core.
+    created_at: Optional[NaiveDatetime] = None
+    updated_at: Optional[NaiveDatetime] = None
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            dt: lambda v: v.isoformat() if v else None
-        }
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 
@@ -225,12 +279,14 @@ class QuranMemorizationOut(BaseModel):
     user_id: UUID # Should probably be str if that's how you query it elsewhere
     percentage: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class ForgotPasswordRequest(BaseModel):
-    email: EmailStr
+    email: EmailLike
+
+    # Entrées : refuse les champs inconnus et normalise les espaces en Rust.
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
 
 class SurahNameResponse(BaseModel):
     surah_name: str
@@ -239,5 +295,17 @@ class RandomAyahResponse(BaseModel):
     id: int
     text: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+
+# === IMPORT-TIME WARMUP ===
+# pydantic builds JSON schemas lazily, so without this the first request (and
+# the first OpenAPI render) pays the schema-build cost. Forcing it here moves
+# that work to import, before any traffic.
+for _model in list(vars().values()):
+    if isinstance(_model, type) and issubclass(_model, BaseModel) and _model is not BaseModel:
+        _model.model_json_schema()
+for _adapter in (ChapterListAdapter, HizbListAdapter, JuzListAdapter,
+                 VerseListAdapter, WarshVerseListAdapter, AyahResultListAdapter):
+    _adapter.json_schema()
+del _model, _adapter